@@ -0,0 +1,45 @@
+"""Fixtures shared by the benchmarks.
+
+The benchmarks are based on `pytest-benchmark` and are not part of the
+default test run. Run them with::
+
+    pytest benchmarks
+
+The benchmarks comparing several implementations are parametrized by kind of
+class (see `location_classes`) and grouped by operation.
+"""
+
+import pytest
+from pydantic import BaseModel
+
+from extendable_pydantic import ExtendableBaseModel, _patch  # noqa: F401
+from tests.conftest import test_registry  # noqa: F401
+
+
+@pytest.fixture
+def location_classes(test_registry):  # noqa: F811
+    """Return the classes to compare by kind.
+
+    * base_model: a plain pydantic model;
+    * assembled: the assembled class of an extendable model;
+    * original: the original class definition of the same extendable model.
+    """
+
+    class PlainLocation(BaseModel):
+        lat: float = 0.1
+        lng: float = 10.1
+        name: str = "loc"
+
+    class Location(ExtendableBaseModel):
+        lat: float = 0.1
+        lng: float = 10.1
+
+    class LocationExtended(Location, extends=True):
+        name: str = "loc"
+
+    test_registry.init_registry()
+    return {
+        "base_model": PlainLocation,
+        "assembled": test_registry[Location.__xreg_name__],
+        "original": Location,
+    }
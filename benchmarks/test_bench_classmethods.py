@@ -0,0 +1,28 @@
+"""Benchmark the classmethods of pydantic.BaseModel called on extendable models."""
+
+import pytest
+
+KINDS = ["base_model", "assembled", "original"]
+DATA = {"lat": 1.0, "lng": 2.0, "name": "a"}
+PAYLOAD = '{"lat": 1.0, "lng": 2.0, "name": "a"}'
+
+
+@pytest.mark.benchmark(group="model_validate")
+@pytest.mark.parametrize("kind", KINDS)
+def test_model_validate(benchmark, location_classes, kind):
+    cls = location_classes[kind]
+    benchmark(lambda: cls.model_validate(DATA))
+
+
+@pytest.mark.benchmark(group="model_validate_json")
+@pytest.mark.parametrize("kind", KINDS)
+def test_model_validate_json(benchmark, location_classes, kind):
+    cls = location_classes[kind]
+    benchmark(lambda: cls.model_validate_json(PAYLOAD))
+
+
+@pytest.mark.benchmark(group="model_dump_json")
+@pytest.mark.parametrize("kind", KINDS)
+def test_model_dump_json(benchmark, location_classes, kind):
+    instance = location_classes[kind](**DATA)
+    benchmark(instance.model_dump_json)
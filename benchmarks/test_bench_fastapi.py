@@ -0,0 +1,29 @@
+"""Benchmark FastAPI request round-trips with extendable models."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+PAYLOAD = {"lat": 1.0, "lng": 2.0, "name": "a"}
+
+
+@pytest.fixture(params=["base_model", "original"])
+def client(request, location_classes):
+    location_cls = location_classes[request.param]
+    app = FastAPI()
+
+    @app.post("/")
+    def post(location: location_cls) -> location_cls:
+        return location
+
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.mark.benchmark(group="fastapi")
+def test_round_trip(benchmark, client):
+    def round_trip():
+        response = client.post("/", json=PAYLOAD)
+        assert response.status_code == 200
+
+    benchmark(round_trip)
@@ -0,0 +1,90 @@
+"""Benchmark the creation of FastAPI routes using extendable models."""
+
+import tracemalloc
+
+try:
+    from typing import Annotated
+except ImportError:
+    from typing_extensions import Annotated
+
+import pytest
+from fastapi import APIRouter, Depends, FastAPI, Request
+from pydantic import TypeAdapter
+
+from extendable_pydantic import _patch
+from extendable_pydantic.utils import resolve_annotation
+
+NB_ROUTES = 800
+NB_DEPENDENCY_ROUTES = 1000
+
+
+def _unshared_type_adapter(registry, new_type, field_info):
+    return TypeAdapter(Annotated[new_type, field_info])
+
+
+@pytest.fixture
+def router(location_classes):
+    location_cls = location_classes["original"]
+    router = APIRouter()
+    for i in range(NB_ROUTES):
+
+        @router.post(f"/route_{i}")
+        def post(location: location_cls) -> location_cls:
+            return location
+
+    return router
+
+
+@pytest.mark.benchmark(group="include_router")
+@pytest.mark.parametrize("shared", [True, False], ids=["shared", "unshared"])
+def test_include_router(benchmark, router, monkeypatch, shared):
+    if not shared:
+        monkeypatch.setattr(_patch, "_get_type_adapter", _unshared_type_adapter)
+
+    def include_router():
+        FastAPI().include_router(router)
+
+    tracemalloc.start()
+    try:
+        include_router()
+        benchmark.extra_info["memory"] = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    benchmark.pedantic(include_router, rounds=3, iterations=1)
+
+
+def _uncached_param_annotation(registry, annotation):
+    return resolve_annotation(annotation, registry)
+
+
+@pytest.fixture
+def dependencies_router(location_classes):
+    location_cls = location_classes["original"]
+    router = APIRouter()
+    for i in range(NB_DEPENDENCY_ROUTES):
+
+        @router.get(f"/route_{i}")
+        def get(
+            request: Request,
+            location: Annotated[location_cls, Depends()],
+            page: int = 1,
+        ) -> int:
+            return page
+
+    return router
+
+
+@pytest.mark.benchmark(group="include_router_dependencies")
+@pytest.mark.parametrize("cached", [True, False], ids=["cached", "uncached"])
+def test_include_router_dependencies(
+    benchmark, dependencies_router, monkeypatch, cached
+):
+    if not cached:
+        monkeypatch.setattr(
+            _patch, "_resolve_param_annotation", _uncached_param_annotation
+        )
+
+    def include_router():
+        FastAPI().include_router(dependencies_router)
+
+    benchmark.pedantic(include_router, rounds=3, iterations=1)
@@ -0,0 +1,84 @@
+"""Benchmark the import of modules defining extendable models."""
+
+import importlib.util
+import itertools
+import sys
+
+import pytest
+from pydantic import BaseModel
+
+from extendable_pydantic import main
+
+NB_MODULES = 10
+NB_MODELS = 50
+NB_BASE_MODEL_CLASSES = 2000
+
+_round = itertools.count()
+
+
+def _write_modules(path):
+    files = []
+    for i in range(NB_MODULES):
+        lines = [
+            "from typing import List, Optional",
+            "from extendable_pydantic import ExtendableBaseModel",
+            "",
+        ]
+        for j in range(NB_MODELS):
+            lines += [
+                f"class Model{j}(ExtendableBaseModel):",
+                "    name: str",
+                "    value: int = 0",
+                "    tags: List[str] = []",
+                "",
+                f"class Model{j}Extended(Model{j}, extends=True):",
+                "    description: Optional[str] = None",
+                "",
+            ]
+        file = path / f"models_{i}.py"
+        file.write_text("\n".join(lines))
+        files.append(file)
+    return files
+
+
+def _import_modules(files):
+    round_ = next(_round)
+    names = []
+    for file in files:
+        name = f"_bench_import_{round_}_{file.stem}"
+        spec = importlib.util.spec_from_file_location(name, file)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+        names.append(name)
+    for name in names:
+        del sys.modules[name]
+
+
+@pytest.mark.parametrize("defer", [True, False], ids=["deferred", "eager"])
+def test_import_models(benchmark, test_registry, tmp_path, monkeypatch, defer):
+    monkeypatch.setattr(main, "defer_original_class_build", defer)
+    files = _write_modules(tmp_path)
+    benchmark.pedantic(_import_modules, args=(files,), rounds=5, iterations=1)
+
+
+@pytest.mark.benchmark(group="base_model_class_definition")
+@pytest.mark.parametrize(
+    "precomputed", [True, False], ids=["precomputed", "introspected"]
+)
+def test_define_base_model_classes(benchmark, test_registry, monkeypatch, precomputed):
+    if not precomputed:
+        # the classmethods of BaseModel are introspected for each class
+        monkeypatch.setattr(
+            main, "_get_forwarded_class_methods", main._compute_forwarded_class_methods
+        )
+
+    def define_classes():
+        for i in range(NB_BASE_MODEL_CLASSES):
+            main.ExtendableModelMeta(
+                f"Model{i}",
+                (BaseModel,),
+                {"__module__": __name__, "__annotations__": {"name": str}},
+            )
+
+    benchmark.pedantic(define_classes, rounds=3, iterations=1)
@@ -0,0 +1,12 @@
+"""Benchmark the instantiation of extendable models."""
+
+import pytest
+
+KINDS = ["base_model", "assembled", "original"]
+
+
+@pytest.mark.benchmark(group="instantiation")
+@pytest.mark.parametrize("kind", KINDS)
+def test_instantiate(benchmark, location_classes, kind):
+    cls = location_classes[kind]
+    benchmark(cls, lat=1.0, lng=2.0, name="a")
@@ -0,0 +1,45 @@
+"""Benchmark the round-trip of instances of extendable models between processes.
+
+Pickling by reference is compared with a round-trip through JSON. The size of
+the payload is stored into the extra info of the benchmark.
+"""
+
+import pickle
+from typing import List
+
+import pytest
+
+from extendable_pydantic import ExtendableBaseModel
+
+NB_ITEMS = 1000
+
+
+@pytest.fixture
+def batch(test_registry):
+    class Location(ExtendableBaseModel):
+        lat: float = 0.1
+        lng: float = 10.1
+
+    class Batch(ExtendableBaseModel):
+        locations: List[Location] = []
+
+    class LocationExtended(Location, extends=True):
+        name: str = "loc"
+
+    test_registry.init_registry()
+    return Batch(
+        locations=[{"lat": i, "lng": i, "name": f"loc{i}"} for i in range(NB_ITEMS)]
+    )
+
+
+@pytest.mark.benchmark(group="round_trip")
+def test_pickle_round_trip(benchmark, batch):
+    benchmark.extra_info["size"] = len(pickle.dumps(batch))
+    benchmark(lambda: pickle.loads(pickle.dumps(batch)))
+
+
+@pytest.mark.benchmark(group="round_trip")
+def test_json_round_trip(benchmark, batch):
+    cls = type(batch)
+    benchmark.extra_info["size"] = len(batch.model_dump_json())
+    benchmark(lambda: cls.model_validate_json(batch.model_dump_json()))
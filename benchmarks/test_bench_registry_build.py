@@ -0,0 +1,163 @@
+"""Benchmark the initialization of a registry."""
+
+import gc
+import tracemalloc
+
+import pytest
+from extendable import context, main, registry
+
+from extendable_pydantic import main as xmain
+from extendable_pydantic import update_registry
+
+from . import test_bench_import
+from .test_bench_import import _import_modules, _write_modules
+
+NB_REGISTRIES = 50
+# number of leaves referenced by the hub and of referrers of the hub
+NB_GRAPH_CLASSES = 300
+
+
+def _init_registry(class_defs):
+    reg = registry.ExtendableClassesRegistry()
+    initial_class_defs = main._extendable_class_defs_by_module
+    main._extendable_class_defs_by_module = class_defs.copy()
+    token = context.extendable_registry.set(reg)
+    try:
+        reg.init_registry()
+    finally:
+        main._extendable_class_defs_by_module = initial_class_defs
+        context.extendable_registry.reset(token)
+    return reg
+
+
+@pytest.fixture
+def class_defs(test_registry, tmp_path):
+    _import_modules(_write_modules(tmp_path))
+    return main._extendable_class_defs_by_module
+
+
+def _write_graph_module(path):
+    """Write a module whose classes reference each other: a hub references
+    all the leaves and is referenced by all the referrers."""
+    lines = [
+        "from typing import Optional",
+        "from extendable_pydantic import ExtendableBaseModel",
+        "",
+    ]
+    for i in range(NB_GRAPH_CLASSES):
+        lines += [f"class Leaf{i}(ExtendableBaseModel):", "    name: str = ''", ""]
+    lines.append("class Hub(ExtendableBaseModel):")
+    lines += [f"    leaf{i}: Optional[Leaf{i}] = None" for i in range(NB_GRAPH_CLASSES)]
+    lines.append("")
+    for i in range(NB_GRAPH_CLASSES):
+        lines += [f"class Referrer{i}(ExtendableBaseModel):", "    hub: Hub", ""]
+    file = path / "graph.py"
+    file.write_text("\n".join(lines))
+    return file
+
+
+@pytest.fixture
+def graph_class_defs(test_registry, tmp_path):
+    _import_modules([_write_graph_module(tmp_path)])
+    return main._extendable_class_defs_by_module
+
+
+@pytest.mark.parametrize("workers", [0, 2, 4, 8])
+def test_init_registry(benchmark, class_defs, monkeypatch, workers):
+    monkeypatch.setattr(xmain, "schema_build_workers", workers)
+    benchmark.extra_info["workers"] = workers
+    benchmark.pedantic(_init_registry, args=(class_defs,), rounds=5, iterations=1)
+
+
+@pytest.mark.benchmark(group="init_registries")
+@pytest.mark.parametrize("shared", [True, False], ids=["shared", "unshared"])
+def test_init_registries_memory(benchmark, class_defs, monkeypatch, shared):
+    monkeypatch.setattr(xmain, "share_assembled_classes", shared)
+
+    def init_registries():
+        return [_init_registry(class_defs) for _i in range(NB_REGISTRIES)]
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        registries = init_registries()
+        gc.collect()
+        benchmark.extra_info["memory"] = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del registries
+    benchmark.pedantic(init_registries, rounds=1, iterations=1)
+
+
+def _extend_one_class(reg, name="Model0"):
+    assembled = next(
+        cls for cls in reg._extendable_classes.values() if cls.__name__ == name
+    )
+    original = assembled.__private_attributes__["_original_cls"].get_default()
+    type(original)(
+        f"{name}Update",
+        (original,),
+        {"__module__": __name__, "__annotations__": {"update": int}, "update": 0},
+        extends=True,
+    )
+
+
+@pytest.mark.benchmark(group="update_registry")
+@pytest.mark.parametrize("nb_modules", [1, 5, 10])
+def test_update_registry(benchmark, test_registry, tmp_path, monkeypatch, nb_modules):
+    monkeypatch.setattr(test_bench_import, "NB_MODULES", nb_modules)
+    _import_modules(_write_modules(tmp_path))
+    class_defs = main._extendable_class_defs_by_module
+    reg = _init_registry(class_defs)
+    _extend_one_class(reg)
+    benchmark.extra_info["classes"] = len(reg._extendable_classes)
+    # the next updates would have nothing to do
+    benchmark.pedantic(_update, args=(reg,), rounds=1, iterations=1)
+
+
+def _update(reg):
+    token = context.extendable_registry.set(reg)
+    try:
+        update_registry(reg)
+    finally:
+        context.extendable_registry.reset(token)
+
+
+@pytest.mark.benchmark(group="update_registry_graph")
+def test_update_registry_graph(benchmark, graph_class_defs):
+    reg = _init_registry(graph_class_defs)
+    # the hub and all the referrers are impacted
+    _extend_one_class(reg, "Leaf0")
+    benchmark.extra_info["classes"] = len(reg._extendable_classes)
+    benchmark.pedantic(_update, args=(reg,), rounds=1, iterations=1)
+
+
+@pytest.mark.benchmark(group="init_registry_graph")
+@pytest.mark.parametrize("shared", [True, False], ids=["shared", "unshared"])
+def test_init_registry_graph(benchmark, graph_class_defs, monkeypatch, shared):
+    monkeypatch.setattr(xmain, "share_assembled_classes", shared)
+    benchmark.pedantic(_init_registry, args=(graph_class_defs,), rounds=3, iterations=1)
+
+
+@pytest.mark.benchmark(group="lazy_build")
+@pytest.mark.parametrize("nb_used", [0, 20, 100])
+@pytest.mark.parametrize("lazy", [True, False], ids=["lazy", "eager"])
+def test_init_registry_lazy(benchmark, class_defs, monkeypatch, lazy, nb_used):
+    monkeypatch.setattr(xmain, "lazy_build", lazy)
+
+    def init_and_use():
+        reg = _init_registry(class_defs)
+        # only the generated models, not the base classes of the library
+        models = [
+            cls
+            for cls in reg._extendable_classes.values()
+            if cls.__name__.startswith("Model")
+        ]
+        token = context.extendable_registry.set(reg)
+        try:
+            for cls in models[:nb_used]:
+                cls(name="n")
+        finally:
+            context.extendable_registry.reset(token)
+
+    benchmark.pedantic(init_and_use, rounds=5, iterations=1)
@@ -0,0 +1,39 @@
+"""Benchmark the resolution of annotations referencing extendable models."""
+
+from typing import Dict, Generic, List, Optional, TypeVar
+
+import pytest
+
+from extendable_pydantic import ExtendableBaseModel
+from extendable_pydantic.utils import resolve_annotation
+
+T = TypeVar("T")
+
+
+@pytest.fixture
+def annotations(test_registry):
+    class Location(ExtendableBaseModel):
+        lat: float = 0.1
+
+    class SearchResult(ExtendableBaseModel, Generic[T]):
+        total: int
+        results: List[T]
+
+    class LocationExtended(Location, extends=True):
+        name: str = "loc"
+
+    # the parametrized generics must be defined before the registry is
+    # initialized to be assembled
+    generic = Optional[List[SearchResult[Location]]]
+    test_registry.init_registry()
+    return {
+        "plain": Dict[str, List[Optional[int]]],
+        "nested": Dict[str, List[Optional[Location]]],
+        "generic": generic,
+    }
+
+
+@pytest.mark.benchmark(group="resolve_annotation")
+@pytest.mark.parametrize("kind", ["plain", "nested", "generic"])
+def test_resolve_annotation(benchmark, annotations, kind):
+    benchmark(resolve_annotation, annotations[kind])
@@ -0,0 +1,57 @@
+"""Benchmark the validation of a batch of extendable models.
+
+The validation of the whole batch by `model_validate_many` is compared with
+a loop calling `model_validate` for each item.
+"""
+
+import json
+
+import pytest
+
+from extendable_pydantic import ExtendableBaseModel
+
+NB_ITEMS = 1000
+
+
+@pytest.fixture
+def location_cls(test_registry):
+    class Location(ExtendableBaseModel):
+        lat: float = 0.1
+        lng: float = 10.1
+
+    class LocationExtended(Location, extends=True):
+        name: str = "loc"
+
+    test_registry.init_registry()
+    return Location
+
+
+@pytest.fixture
+def items():
+    return [{"lat": i, "lng": i, "name": f"loc{i}"} for i in range(NB_ITEMS)]
+
+
+@pytest.mark.benchmark(group="validate_many")
+def test_validate_loop(benchmark, location_cls, items):
+    benchmark(lambda: [location_cls.model_validate(item) for item in items])
+
+
+@pytest.mark.benchmark(group="validate_many")
+def test_validate_many(benchmark, location_cls, items):
+    benchmark(location_cls.model_validate_many, items)
+
+
+@pytest.mark.benchmark(group="validate_many")
+def test_validate_many_collect_errors(benchmark, location_cls, items):
+    benchmark(lambda: location_cls.model_validate_many(items, collect_errors=True))
+
+
+@pytest.mark.benchmark(group="validate_json_many")
+def test_validate_json_loop(benchmark, location_cls, items):
+    data = [json.dumps(item) for item in items]
+    benchmark(lambda: [location_cls.model_validate_json(item) for item in data])
+
+
+@pytest.mark.benchmark(group="validate_json_many")
+def test_validate_json_many(benchmark, location_cls, items):
+    benchmark(location_cls.model_validate_json_many, json.dumps(items))
@@ -0,0 +1,3 @@
+Add the ``xreg_auto_discriminator`` model config key to turn the unions of
+models sharing a required ``Literal`` field into tagged unions once the
+classes are assembled.
@@ -0,0 +1,3 @@
+The classmethods of ``pydantic.BaseModel`` called on an original class
+definition are resolved once per registry to the methods of the assembled
+class instead of being forwarded at each call.
@@ -0,0 +1,4 @@
+Defer the build of the pydantic schema, validator and serializer of the
+original class definitions. Only the assembled classes are built when the
+registry is initialized. This can be disabled with
+``extendable_pydantic.main.defer_original_class_build = False``.
@@ -0,0 +1,3 @@
+Cache the assembled class used when instantiating an extendable model through
+its original class definition. The cache is kept per registry and is dropped
+when the registry is initialized again.
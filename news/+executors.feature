@@ -0,0 +1,4 @@
+Add ``RegistryThreadPoolExecutor``, ``RegistryProcessPoolExecutor`` and
+``bind_registry`` into ``extendable_pydantic.executors`` to run callables into
+thread and process pools with a registry bound. The worker processes
+initialize their registry once, when they start.
@@ -0,0 +1,3 @@
+Add the ``fingerprint`` strategy for the schema references of the extendable
+models (``extendable_pydantic.main.type_ref_strategy``). The references no
+longer depend on the id of the classes and are stable between processes.
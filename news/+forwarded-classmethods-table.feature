@@ -0,0 +1,3 @@
+The classmethods of ``pydantic.BaseModel`` forwarded to the assembled classes are
+introspected once per process and their descriptors are shared by all the
+classes.
@@ -0,0 +1,4 @@
+Assemble on demand the parametrized generics of extendable models that are
+not part of the registry (e.g. parametrized once the registry is initialized)
+and keep the assembled classes per registry into a bounded LRU cache with hit,
+miss and eviction counters.
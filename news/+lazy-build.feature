@@ -0,0 +1,3 @@
+Add ``extendable_pydantic.main.lazy_build`` to resolve the fields and build
+the schema of the assembled classes on first use instead of at the
+initialization of the registry.
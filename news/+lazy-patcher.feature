@@ -0,0 +1,3 @@
+The ``extendable_pydantic_patcher.pth`` file no longer imports pydantic, wrapt
+and extendable at the startup of every python interpreter. The FastAPI
+integration is loaded the first time ``fastapi`` is imported.
@@ -0,0 +1,3 @@
+Cache the OpenAPI schema of the FastAPI applications per registry. The cached
+schema is dropped when the registry is initialized again or when the routes of
+the application change.
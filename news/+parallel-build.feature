@@ -0,0 +1,2 @@
+Add ``extendable_pydantic.main.schema_build_workers`` to build the schemas of
+independent assembled classes concurrently when the registry is initialized.
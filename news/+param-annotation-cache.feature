@@ -0,0 +1,2 @@
+Skip the resolution of the FastAPI parameters annotated with plain types and
+cache the resolved annotations of the other ones per registry.
@@ -0,0 +1,3 @@
+Instances of the assembled classes are pickled by reference to their original
+class. They are restored without validation as instances of the assembled
+class of the registry of the unpickling process.
@@ -0,0 +1,3 @@
+Cache the result of ``resolve_annotation`` per registry. The cache is bounded
+(see ``extendable_pydantic.utils.resolve_annotation_cache_size``) and dropped
+when the registry is initialized again or garbage collected.
@@ -0,0 +1,2 @@
+Add ``extendable_pydantic.main.share_assembled_classes`` to share the
+assembled classes with the same composition between registries.
@@ -0,0 +1,4 @@
+Build the schema of each assembled class only once when the registry is
+initialized. The schema is no longer built when the assembled class is
+created, but once the fields referencing other extendable models are
+resolved, in the order of the dependencies between the models.
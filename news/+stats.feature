@@ -0,0 +1,2 @@
+Add ``extendable_pydantic.stats`` and ``python -m extendable_pydantic`` to
+report the time spent to assemble, resolve and build each assembled class.
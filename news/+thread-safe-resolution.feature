@@ -0,0 +1,3 @@
+The resolution of the fields of the assembled classes is thread-safe. A class
+is flagged as ready once its schema is built and the other threads wait for the
+resolution in progress instead of using a partially built class.
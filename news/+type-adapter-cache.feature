@@ -0,0 +1,3 @@
+FastAPI fields declared with the same type and field options now share one
+TypeAdapter per registry, reducing startup time and memory for apps with many
+routes.
@@ -0,0 +1,2 @@
+Add ``update_registry`` to add the newly loaded modules to a registry. Only
+the classes impacted by these modules are assembled and built again.
@@ -0,0 +1,5 @@
+Add the ``model_validate_many`` and ``model_validate_json_many`` classmethods
+to ``ExtendableBaseModel``. They validate a whole list or JSON array by a
+single call to pydantic-core through a list TypeAdapter cached per registry.
+With ``collect_errors=True``, the errors are returned per item instead of
+aborting the batch.
@@ -0,0 +1,2 @@
+Add ``warm_registry`` to build, before forking the worker processes, the state
+lazily built for the assembled classes and the FastAPI applications.
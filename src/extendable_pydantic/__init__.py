@@ -2,6 +2,8 @@
 
 # shortcut to main used class
 from .main import ExtendableModelMeta
+from .main import update_registry
 from .models import ExtendableBaseModel
 from .models import StrictExtendableBaseModel
 from .version import __version__
+from .warmup import warm_registry
@@ -0,0 +1,61 @@
+"""Print statistics about the build of a registry.
+
+Usage::
+
+    python -m extendable_pydantic [--limit N] MODULE [MODULE ...]
+
+The given modules are imported and a registry is initialized with the
+extendable classes they define. The slowest classes to build are printed
+with the number of rebuilds of their schema.
+"""
+
+import argparse
+import importlib
+import sys
+from typing import List, Optional
+
+from extendable import context, registry
+
+from . import stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m extendable_pydantic",
+        description="Print statistics about the build of a registry.",
+    )
+    parser.add_argument("modules", nargs="+", metavar="MODULE")
+    parser.add_argument(
+        "--limit", type=int, default=20, help="number of classes to print"
+    )
+    args = parser.parse_args(argv)
+
+    stats.enable()
+    for module in args.modules:
+        importlib.import_module(module)
+    _registry = registry.ExtendableClassesRegistry()
+    token = context.extendable_registry.set(_registry)
+    try:
+        _registry.init_registry(list(args.modules))
+    finally:
+        context.extendable_registry.reset(token)
+    registry_stats = stats.get_registry_stats(_registry)
+
+    columns = "{:<60} {:>10} {:>10} {:>10} {:>8} {:>8}"
+    print(columns.format("class", "assembly", "resolve", "build", "rebuilds", "schema"))
+    for class_stats in [*registry_stats.slowest(args.limit), registry_stats.total]:
+        print(
+            columns.format(
+                class_stats.name[-60:],
+                f"{class_stats.assembly_time * 1000:.2f}ms",
+                f"{class_stats.resolve_time * 1000:.2f}ms",
+                f"{class_stats.build_time * 1000:.2f}ms",
+                class_stats.rebuild_count,
+                class_stats.core_schema_size,
+            )
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,25 +1,57 @@
 #  type: ignore
 # ruff: noqa: E402
 
-# The following 2 lines are required to prevent import error if others dependecies
-# are not yet available into the python path when this file is loaded.
-# This should be done by default unless the Python interpreter was started
-# with the -S flag. It's at least required when this lib is deployed into odoo.sh
-import site
-
-site.main()
-
+# This module is imported by extendable_pydantic_patcher when fastapi is
+# imported.
 
 try:
     from typing import Annotated
 except ImportError:
     from typing_extensions import Annotated
 
+import abc
+import enum
+import threading
+import weakref
+
 import wrapt
 from extendable import context
 from pydantic import TypeAdapter
 
-from .utils import all_identical, resolve_annotation
+from pydantic.fields import FieldInfo
+
+from .utils import all_identical, get_registry_cache, resolve_annotation
+
+
+def _field_info_key(field_info):
+    # The key is built from the public attributes of the field info. Unhashable
+    # values are identified by the id of the attribute value, which is kept
+    # alive by the field info referenced by the cached adapter.
+    key = []
+    for name in FieldInfo.__slots__:
+        if name.startswith("_") or name == "annotation":
+            continue
+        value = getattr(field_info, name, None)
+        key_value = tuple(value) if isinstance(value, list) else value
+        try:
+            hash(key_value)
+        except TypeError:
+            key_value = id(value)
+        key.append((name, type(value), key_value))
+    return tuple(key)
+
+
+def _get_type_adapter(registry, new_type, field_info):
+    # Routes sharing the same model share the same adapter
+    adapters = get_registry_cache(registry, "type_adapters")
+    try:
+        key = (new_type, _field_info_key(field_info))
+        adapter = adapters.get(key)
+    except TypeError:  # unhashable annotation
+        return TypeAdapter(Annotated[new_type, field_info])
+    if adapter is None:
+        adapter = adapters[key] = TypeAdapter(Annotated[new_type, field_info])
+    return adapter
 
 
 def _resolve_model_fields_annotation(model_fields):
@@ -30,7 +62,7 @@ def _resolve_model_fields_annotation(model_fields):
             new_type = resolve_annotation(field_info.annotation)
             if not all_identical(field_info.annotation, new_type):
                 field_info.annotation = new_type
-                field._type_adapter = TypeAdapter(Annotated[new_type, field_info])
+                field._type_adapter = _get_type_adapter(registry, new_type, field_info)
     return model_fields
 
 
@@ -51,6 +83,46 @@ def hook_fastapi_openapi_utils(utils):
     )
 
 
+def _same_routes(routes, other_routes):
+    return len(routes) == len(other_routes) and all(
+        route is other for route, other in zip(routes, other_routes)
+    )
+
+
+@wrapt.when_imported("fastapi.applications")
+def hook_fastapi_applications(applications):
+    # The openapi schema is cached by fastapi on the app whatever the registry
+    # used to build it. When an app serves several registries, the schema is
+    # cached per registry instead and is dropped when the registry is
+    # initialized again or when the routes of the app change.
+    # The attribute of the app is shared by the registries, it's only written
+    # to build a schema, under a lock. A schema assigned to the attribute by
+    # the app itself (e.g. a customized schema) is returned as is.
+    lock = threading.Lock()
+    # last schema generated by the wrapper per app
+    generated = weakref.WeakKeyDictionary()
+
+    def _openapi_wrapper(wrapped, instance, args, kwargs):
+        registry = context.extendable_registry.get()
+        if not (registry and registry.ready):
+            return wrapped(*args, **kwargs)
+        assigned = instance.openapi_schema
+        if assigned is not None and assigned is not generated.get(instance):
+            return assigned
+        schemas = get_registry_cache(registry, "openapi", weakref.WeakKeyDictionary)
+        routes = tuple(instance.routes)
+        cached = schemas.get(instance)
+        if cached is not None and _same_routes(routes, cached[0]):
+            return cached[1]
+        with lock:
+            instance.openapi_schema = None
+            schema = generated[instance] = wrapped(*args, **kwargs)
+        schemas[instance] = (routes, schema)
+        return schema
+
+    wrapt.wrap_function_wrapper(applications, "FastAPI.openapi", _openapi_wrapper)
+
+
 @wrapt.when_imported("fastapi.utils")
 def hook_fastapi_utils(utils):
     # This method is used by fastapi to build the fields definition for all
@@ -79,6 +151,25 @@ def hook_fastapi_utils(utils):
         )
 
 
+# Metaclasses of the annotations that can't reference an extendable class
+# (int, str, Request, enums, ...). The metaclass of the extendable models is a
+# subclass of these ones, not one of them.
+_PLAIN_ANNOTATION_METACLASSES = frozenset({type, abc.ABCMeta, enum.EnumMeta})
+
+
+def _resolve_param_annotation(registry, annotation):
+    if type(annotation) in _PLAIN_ANNOTATION_METACLASSES:
+        return annotation
+    annotations = get_registry_cache(registry, "param_annotations")
+    try:
+        return annotations[annotation]
+    except KeyError:
+        new_type = annotations[annotation] = resolve_annotation(annotation, registry)
+        return new_type
+    except TypeError:  # unhashable annotation
+        return resolve_annotation(annotation, registry)
+
+
 @wrapt.when_imported("fastapi.dependencies.utils")
 def hook_fastapi_dependencies_utils(utils):
     def _analyze_param_wrapper(wrapped, instance, args, kwargs):
@@ -86,7 +177,7 @@ def hook_fastapi_dependencies_utils(utils):
         if registry and registry.ready:
             annotation = kwargs.get("annotation")
             if annotation:
-                new_type = resolve_annotation(annotation)
+                new_type = _resolve_param_annotation(registry, annotation)
                 if not all_identical(annotation, new_type):
                     kwargs["annotation"] = new_type
         return wrapped(*args, **kwargs)
@@ -0,0 +1,146 @@
+"""Run callables into thread and process pools with a registry bound.
+
+The current registry is stored into a context variable which is not
+propagated to the threads of a pool nor to the worker processes. The helpers
+of this module bind the registry explicitly:
+
+* into the thread pools, the registry of the caller is bound around each
+  call;
+* into the process pools, the registry is initialized once by each worker
+  process from the modules defining the extendable classes.
+"""
+
+import functools
+import importlib
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from extendable import context
+from extendable.registry import ExtendableClassesRegistry
+from typing_extensions import ParamSpec
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+@contextmanager
+def use_registry(
+    registry: Optional[ExtendableClassesRegistry],
+) -> Iterator[Optional[ExtendableClassesRegistry]]:
+    """Make `registry` the current registry within the context."""
+    token = context.extendable_registry.set(registry)
+    try:
+        yield registry
+    finally:
+        context.extendable_registry.reset(token)
+
+
+def bind_registry(
+    fn: Callable[P, T], registry: Optional[ExtendableClassesRegistry] = None
+) -> Callable[P, T]:
+    """Return a callable calling `fn` with `registry` as current registry.
+
+    The registry defaults to the current registry when `bind_registry` is
+    called. The returned callable can be given to `loop.run_in_executor` or
+    to any executor:
+
+    ```py
+    await loop.run_in_executor(None, bind_registry(validate_batch), batch)
+    ```
+    """
+    registry = registry if registry else context.extendable_registry.get()
+
+    @functools.wraps(fn)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        with use_registry(registry):
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+class RegistryThreadPoolExecutor(ThreadPoolExecutor):
+    """A thread pool calling the submitted callables with a registry bound.
+
+    The registry defaults to the current registry when the executor is
+    created.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        *args: Any,
+        registry: Optional[ExtendableClassesRegistry] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(max_workers, *args, **kwargs)
+        self.registry = registry if registry else context.extendable_registry.get()
+
+    # the double underscore makes the callable a positional-only argument on
+    # python 3.7 (PEP 484)
+    def submit(
+        self, __fn: Callable[P, T], *args: P.args, **kwargs: P.kwargs
+    ) -> "Future[T]":
+        return super().submit(bind_registry(__fn, self.registry), *args, **kwargs)
+
+
+def _init_worker(
+    modules: Sequence[str],
+    module_matchings: Optional[List[str]],
+    initializer: Optional[Callable[..., Any]],
+    initargs: Tuple[Any, ...],
+) -> None:
+    for module in modules:
+        importlib.import_module(module)
+    _registry = ExtendableClassesRegistry()
+    # The registry stays the current one of the worker process: the
+    # initializer and the tasks are run by the same thread.
+    context.extendable_registry.set(_registry)
+    _registry.init_registry(module_matchings)
+    if initializer is not None:
+        initializer(*initargs)
+
+
+class RegistryProcessPoolExecutor(ProcessPoolExecutor):
+    """A process pool whose worker processes initialize their own registry.
+
+    Each worker process imports `modules` and initializes a registry with the
+    extendable classes defined into `module_matchings` (defaults to
+    `modules`) once, when it starts. The submitted callables, their arguments
+    and their results must be picklable.
+
+    ```py
+    with RegistryProcessPoolExecutor(4, modules=["my.models"]) as executor:
+        results = list(executor.map(validate_batch, batches))
+    ```
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        *,
+        modules: Iterable[str] = (),
+        module_matchings: Optional[List[str]] = None,
+        initializer: Optional[Callable[..., Any]] = None,
+        initargs: Tuple[Any, ...] = (),
+        **kwargs: Any,
+    ) -> None:
+        modules = tuple(modules)
+        if module_matchings is None:
+            module_matchings = list(modules)
+        super().__init__(
+            max_workers,
+            initializer=_init_worker,
+            initargs=(modules, module_matchings, initializer, initargs),
+            **kwargs,
+        )
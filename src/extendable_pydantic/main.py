@@ -1,13 +1,41 @@
 from __future__ import annotations
 
+import copyreg
+import dataclasses
+import functools
+import hashlib
 import inspect
-import typing
+import pickle
+import re
+import threading
+import time
 import warnings
-from typing import Any, Dict, List, Optional, cast, no_type_check
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar, copy_context
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    cast,
+    no_type_check,
+)
 
 from extendable import context, main
 from extendable.main import ExtendableMeta
-from extendable.registry import ExtendableClassesRegistry, ExtendableRegistryListener
+from extendable.registry import (
+    ExtendableClassesRegistry,
+    ExtendableRegistryListener,
+    ModuleIndex,
+)
 
 try:
     from typing import _TypingBase  # type: ignore[attr-defined,unused-ignore]
@@ -17,27 +45,418 @@ except ImportError:
 from pydantic._internal._model_construction import ModelMetaclass
 from pydantic.fields import FieldInfo
 from pydantic.main import BaseModel
+from typing_extensions import get_args, get_origin
 
-from .utils import all_identical, resolve_annotation
+from . import stats
+from .utils import (
+    CacheInfo,
+    LRUCache,
+    _is_parametrized,
+    all_identical,
+    clear_registry_caches,
+    discriminate_unions,
+    get_registry_cache,
+    resolve_annotation,
+)
 
 typing_base = _TypingBase
 
+# Number of threads used to build the schemas of the assembled classes when the
+# registry is initialized. With 0 or 1, the schemas are built sequentially.
+# Building in parallel pays off on free-threaded python builds or when
+# pydantic-core releases the GIL.
+schema_build_workers = 0
 
-if typing.TYPE_CHECKING:
-    AnyClassmethod = classmethod[Any, Any, Any]
+# If True, the pydantic schema, validator and serializer of the original class
+# definitions are not built when the class is defined. Original classes are
+# replaced by the assembled classes once the registry is initialized, so the
+# build is only done if the original class is used directly. This doesn't
+# apply to classes where `defer_build` is explicitly set into the config.
+defer_original_class_build = True
+
+# Strategy used to make the schema reference of the extendable models unique:
+# * "id": the id of the class is appended to its name. The references differ
+#   between registries and processes;
+# * "fingerprint": a fingerprint of the composition of the class (the classes
+#   of its MRO) and of its fields is appended to its name. Classes with the
+#   same composition get the same reference in every registry and process.
+type_ref_strategy = "id"
+
+# If True, an assembled class is shared between the registries where it has
+# the same composition and the same fields, transitively (see get_fingerprint).
+# The class assembled by the registry is then dropped before its schema is
+# built.
+share_assembled_classes = False
+
+# If True, the fields of the assembled classes are not resolved and their
+# schema is not built when the registry is initialized but the first time the
+# class is used (instantiation, pydantic classmethods, lookup of the assembled
+# class). The classes are still assembled by the registry.
+lazy_build = False
+
+# Maximum number of assembled classes of parametrized generics of extendable
+# models kept per registry. The least recently used ones are evicted first.
+# The generics parametrized once the registry is initialized are assembled on
+# demand. An evicted class is not released as long as the other registry caches
+# still reference it (the resolved annotations, the type adapters and the
+# annotations of the fastapi params, the list adapters of the models): the
+# memory is only bounded by all these caches together.
+parametrized_generics_cache_size = 256
+
+# Key of the model config enabling the automatic discrimination of the unions
+# of models into the fields of the assembled class. Once the fields are
+# resolved, the unions of models sharing a `Literal` field with disjoint values
+# are replaced by tagged unions (see utils.discriminate_unions). e.g.
+# model_config = {"xreg_auto_discriminator": True}
+AUTO_DISCRIMINATOR = "xreg_auto_discriminator"
+
+# name of the registry cache mapping an original class to its assembled class
+_DISPATCH_CACHE = "dispatch"
+# name of the registry cache mapping a parametrized generic to its assembled
+# class
+_GENERICS_CACHE = "parametrized_generics"
+# name of the registry cache mapping (original class, method name) to the
+# classmethod bound to the assembled class
+_CLASSMETHOD_CACHE = "classmethods"
+
+
+def _is_aggregated(cls: type) -> bool:
+    """Return True if `cls` is an aggregated class.
+
+    The answer never changes for a given class, it's therefore stored on
+    the class itself to avoid the lookup of the private attribute at each call.
+    """
+    is_aggregated = cls.__dict__.get("__xreg_is_aggregated__")
+    if is_aggregated is None:
+        value = cls._is_aggregated_class  # type: ignore[attr-defined]
+        is_aggregated = bool(getattr(value, "default", value))
+        type.__setattr__(cls, "__xreg_is_aggregated__", is_aggregated)
+    return cast(bool, is_aggregated)
+
+
+def _get_generics_cache(registry: ExtendableClassesRegistry) -> LRUCache:
+    return cast(
+        LRUCache,
+        get_registry_cache(
+            registry,
+            _GENERICS_CACHE,
+            lambda: LRUCache(parametrized_generics_cache_size),
+        ),
+    )
+
+
+def get_parametrized_generics_cache_info(
+    registry: ExtendableClassesRegistry,
+) -> CacheInfo:
+    """Return the statistics of the cache of the parametrized generics of
+    `registry`."""
+    return _get_generics_cache(registry).info()
+
+
+# True while the assembled class of a parametrized generic is created on
+# demand (see _parametrize_assembled_cls). The classes created meanwhile are
+# handled as in the build mode of the registry, but only into the current
+# context: the build mode is a process-wide flag that would also apply to the
+# classes defined by the other threads.
+_assembling: ContextVar[bool] = ContextVar("_assembling", default=False)
+
+
+def _in_build_mode() -> bool:
+    return main._registry_build_mode or _assembling.get()
+
+
+def _parametrize_assembled_cls(cls: type, registry: ExtendableClassesRegistry) -> type:
+    """Return the assembled class of the parametrized generic `cls`.
+
+    If `cls` isn't part of the registry (e.g. parametrized once the registry
+    is initialized), the assembled class of its origin is parametrized with
+    the same arguments and its fields are resolved into `registry`.
+    """
+    if cls.__xreg_name__ in registry._extendable_classes:  # type: ignore[attr-defined]
+        return cast(type, cls._get_assembled_cls(registry))  # type: ignore[attr-defined]
+    metadata = cls.__pydantic_generic_metadata__  # type: ignore[attr-defined]
+    origin = metadata["origin"]._get_assembled_cls(registry)
+    args = metadata["args"]
+    with _resolve_lock:
+        # the parametrized class is not collected as a new class definition
+        # and is flagged as an assembled class
+        token = _assembling.set(True)
+        try:
+            assembled = origin[args if len(args) > 1 else args[0]]
+        finally:
+            _assembling.reset(token)
+        if "__xreg_ready__" not in assembled.__dict__:
+            # not a class returned by the cache of pydantic
+            assembled.__xreg_fields_resolved__ = False
+            assembled.__xreg_ready__ = False
+            assembled._resolve_submodel_fields(registry)
+    return cast(type, assembled)
+
+
+def _get_cached_assembled_cls(cls: type, registry: ExtendableClassesRegistry) -> type:
+    """Return the assembled class of the original class `cls`.
+
+    Once the registry is ready, the result is cached per registry. The
+    assembled classes of the parametrized generics are kept into a bounded
+    cache since they can be many and be built on demand.
+    """
+    if _is_parametrized(cls):
+        if _is_aggregated(cls):
+            # already assembled, e.g. on demand. Such a class has the name of
+            # its origin into the registry.
+            return cls
+        generics = _get_generics_cache(registry)
+        assembled = generics.lookup(cls)
+        if assembled is None:
+            assembled = _parametrize_assembled_cls(cls, registry)
+            if registry.ready:
+                generics.store(cls, assembled)
+        return cast(type, assembled)
+    dispatch = get_registry_cache(registry, _DISPATCH_CACHE)
+    assembled = dispatch.get(cls)
+    if assembled is None:
+        assembled = cls._get_assembled_cls(registry)  # type: ignore[attr-defined]
+        if registry.ready:
+            dispatch[cls] = assembled
+    return cast(type, assembled)
+
+
+def _get_config_value(
+    bases: Tuple[type, ...], namespace: Dict[str, Any], key: str
+) -> Any:
+    """Return the value of `key` into the pydantic config of the class to create."""
+    value = None
+    for base in bases:
+        value = getattr(base, "model_config", {}).get(key, value)
+    config = namespace.get("model_config") or {}
+    return config.get(key, value)
+
+
+class _ForwardedClassMethod(classmethod):  # type: ignore[type-arg]
+    """Forward a classmethod of pydantic.BaseModel to the assembled class.
+
+    When accessed on an aggregated class, the method defined by
+    pydantic.BaseModel is bound to this class. When accessed on an original
+    class definition, the method bound to the assembled class is returned. This
+    bound method is cached per registry so that the assembled class is only
+    looked up at the first access.
+    """
+
+    def __init__(self, name: str) -> None:
+        method = inspect.getattr_static(BaseModel, name)
+        super().__init__(method.__func__)
+        self.name = name
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        if owner is None:
+            owner = type(instance)
+        registry = context.extendable_registry.get()
+        if _is_aggregated(owner) or registry is None:
+            # the method is called on the assembled class or without registry
+            if lazy_build:
+                _ensure_resolved(owner, registry)
+            return super().__get__(instance, owner)
+        if not registry.ready:
+            return self._get_uncached(instance, owner, registry)
+        try:
+            if _is_parametrized(owner):
+                assembled = _get_cached_assembled_cls(owner, registry)
+                if assembled is owner:
+                    return super().__get__(instance, owner)
+                return getattr(assembled, self.name)
+            methods = get_registry_cache(registry, _CLASSMETHOD_CACHE)
+            key = (owner, self.name)
+            method = methods.get(key)
+            if method is None:
+                assembled = owner._get_assembled_cls(registry)  # type: ignore[attr-defined]
+                if assembled is owner:
+                    return super().__get__(instance, owner)
+                method = methods[key] = getattr(assembled, self.name)
+            return method
+        except KeyError:
+            # the class is not part of the registry (e.g. defined once the
+            # registry is initialized), the method is bound to the class itself
+            return super().__get__(instance, owner)
+
+    def _get_uncached(
+        self, instance: Any, owner: type, registry: ExtendableClassesRegistry
+    ) -> Any:
+        """Return the method bound to the assembled class of `owner` while
+        `registry` is being built (e.g. into a registry listener).
+
+        The method is not cached and is bound to `owner` itself if it's not
+        assembled yet.
+        """
+        assembled = registry.get(owner.__xreg_name__, None)  # type: ignore[attr-defined]
+        if assembled is None or assembled is owner:
+            return super().__get__(instance, owner)
+        return getattr(assembled, self.name)
+
+
+def _compute_forwarded_class_methods() -> Dict[str, _ForwardedClassMethod]:
+    from pydantic.warnings import PydanticDeprecationWarning
+
+    with warnings.catch_warnings():
+        # ignore warnings about deprecated methods into pydantic.BaseModel
+        warnings.filterwarnings("ignore", category=PydanticDeprecationWarning)
+        methods = inspect.getmembers(BaseModel, inspect.ismethod)
+    return {
+        name: _ForwardedClassMethod(name)
+        for name, _method in methods
+        if not name.startswith("__")
+    }
+
+
+# classmethods of pydantic.BaseModel forwarded to the assembled classes by
+# name, computed once and shared by all the classes (see
+# _get_forwarded_class_methods)
+_forwarded_class_methods: Optional[Dict[str, _ForwardedClassMethod]] = None
+
+
+def _get_forwarded_class_methods() -> Dict[str, _ForwardedClassMethod]:
+    global _forwarded_class_methods
+    if _forwarded_class_methods is None:
+        _forwarded_class_methods = _compute_forwarded_class_methods()
+    return _forwarded_class_methods
+
+
+# private attributes set by extendable on the assembled classes. They reference
+# the classes and are restored from the class of the unpickling process.
+_CLASS_PRIVATE_ATTRIBUTES = ("_is_aggregated_class", "_original_cls")
+
+
+def _reduce_model(self: BaseModel) -> Tuple[Any, ...]:
+    """Pickle the instances of the assembled classes by reference.
+
+    The assembled classes are created at runtime and can't be pickled. The
+    instance is pickled as the name of its original class and its state and
+    is restored as an instance of the assembled class of the registry of the
+    unpickling process (see `_restore_model`). The instances of parametrized
+    generics are pickled as the name of the original class of their origin
+    and their arguments (see `_restore_generic_model`).
+    """
+    cls = type(self)
+    state = self.__getstate__()
+    if not _is_aggregated(cls):
+        return copyreg.__newobj__, (cls,), state  # type: ignore[attr-defined]
+    private = state["__pydantic_private__"]
+    if private:
+        state["__pydantic_private__"] = {
+            name: value
+            for name, value in private.items()
+            if name not in _CLASS_PRIVATE_ATTRIBUTES
+        }
+    if _is_parametrized(cls):
+        metadata = cls.__pydantic_generic_metadata__
+        return _restore_generic_model, (
+            metadata["origin"].__xreg_name__,  # type: ignore[union-attr]
+            metadata["args"],
+            state,
+        )
+    return _restore_model, (cls.__xreg_name__, state)  # type: ignore[attr-defined]
+
+
+def _get_unpickling_registry(name: str) -> ExtendableClassesRegistry:
+    registry = context.extendable_registry.get()
+    if registry is None:
+        raise pickle.UnpicklingError(
+            f"No registry to restore an instance of {name}. An instance of an "
+            "extendable model can only be unpickled with a registry "
+            "initialized."
+        )
+    return registry
+
+
+def _restore_model(name: str, state: Dict[str, Any]) -> BaseModel:
+    """Restore an instance pickled by `_reduce_model` without validation."""
+    registry = _get_unpickling_registry(name)
+    cls = cast(Type[BaseModel], registry[name])
+    if lazy_build:
+        _ensure_resolved(cls, registry)
+    return _new_model(cls, state)
+
+
+def _restore_generic_model(
+    name: str, args: Tuple[Any, ...], state: Dict[str, Any]
+) -> BaseModel:
+    """Restore an instance of a parametrized generic pickled by `_reduce_model`
+    without validation."""
+    registry = _get_unpickling_registry(name)
+    origin: Any = registry._extendable_class_defs[name].original_cls
+    parametrized = origin[args if len(args) > 1 else args[0]]
+    cls = cast(Type[BaseModel], _get_cached_assembled_cls(parametrized, registry))
+    return _new_model(cls, state)
+
+
+def _new_model(cls: Type[BaseModel], state: Dict[str, Any]) -> BaseModel:
+    private_attributes = cls.__private_attributes__
+    if private_attributes:
+        private = {
+            name: private_attributes[name].get_default()
+            for name in _CLASS_PRIVATE_ATTRIBUTES
+            if name in private_attributes
+        }
+        private.update(state["__pydantic_private__"] or {})
+        state["__pydantic_private__"] = private
+    instance = cls.__new__(cls)
+    instance.__setstate__(state)
+    return instance
 
 
 class ExtendableModelMeta(ExtendableMeta, ModelMetaclass):
     __xreg_fields_resolved__: bool = False
+    __xreg_ready__: bool = False
+    __xreg_build_pending__: bool = False
+
+    @no_type_check
+    def __new__(metacls, name, bases, namespace, extends=None, **kwargs):
+        if _assembling.get():
+            # as ExtendableMeta.__new__ in build mode
+            return metacls._build_original_class(
+                name=name, bases=bases, namespace=namespace, **kwargs
+            )
+        return super().__new__(metacls, name, bases, namespace, extends, **kwargs)
 
     @no_type_check
     @classmethod
     def _build_original_class(metacls, name, bases, namespace, **kwargs):
-        if not main._registry_build_mode and BaseModel in bases:
-            # we must wrap all the classmethod defined into pydantic.BaseModel
-            metacls._wrap_pydantic_base_model_class_methods(namespace)
-            pass
-        return ModelMetaclass.__new__(metacls, name, bases, namespace, **kwargs)
+        collector = stats.collector
+        if collector is None or not _in_build_mode():
+            return metacls._new_model_class(name, bases, namespace, **kwargs)
+        start = time.perf_counter()
+        cls = metacls._new_model_class(name, bases, namespace, **kwargs)
+        collector.get(cls).assembly_time += time.perf_counter() - start
+        return cls
+
+    @no_type_check
+    @classmethod
+    def _new_model_class(metacls, name, bases, namespace, **kwargs):
+        if BaseModel in bases:
+            if not _in_build_mode():
+                # we must wrap all the classmethod defined into pydantic.BaseModel
+                metacls._wrap_pydantic_base_model_class_methods(namespace)
+            # the namespace of the class definition is copied before, the
+            # assembled classes get the method when they are built
+            namespace.setdefault("__reduce__", _reduce_model)
+        if "defer_build" in kwargs or (
+            _get_config_value(bases, namespace, "defer_build") is not None
+        ):
+            return ModelMetaclass.__new__(metacls, name, bases, namespace, **kwargs)
+        if _in_build_mode():
+            # The schema of the assembled class is built only once, when its
+            # fields referencing other extendable models are resolved.
+            # (see _resolve_submodel_fields)
+            namespace["__xreg_build_pending__"] = True
+        elif not defer_original_class_build:
+            return ModelMetaclass.__new__(metacls, name, bases, namespace, **kwargs)
+        cls = ModelMetaclass.__new__(
+            metacls, name, bases, namespace, defer_build=True, **kwargs
+        )
+        # the assembled classes and the subclasses must not inherit the flag
+        config = dict(cls.model_config)
+        del config["defer_build"]
+        cls.model_config = config
+        return cls
 
     @no_type_check
     @classmethod
@@ -48,6 +467,8 @@ class ExtendableModelMeta(ExtendableMeta, ModelMetaclass):
             name=name, bases=bases, namespace=namespace, extends=extends, **kwargs
         )
         namespace["__xreg_fields_resolved__"] = False
+        namespace["__xreg_ready__"] = False
+        namespace["__xreg_build_pending__"] = False
         return namespace
 
     @no_type_check
@@ -58,70 +479,287 @@ class ExtendableModelMeta(ExtendableMeta, ModelMetaclass):
         will be an instance of the aggregated class not an instance of
         the original class definition since this definition could have
         been extended.
+
+        Once the registry is ready, the assembled class is cached per registry
+        so that the lookup is only done at the first instantiation.
         """
-        is_aggregated = getattr(
-            cls._is_aggregated_class, "default", cls._is_aggregated_class
-        )
-        if is_aggregated:
+        if _is_aggregated(cls):
+            if lazy_build:
+                _ensure_resolved(cls)
             return super().__call__(*args, **kwargs)
-        return cls._get_assembled_cls()(*args, **kwargs)
+        registry = context.extendable_registry.get()
+        if registry is None:
+            return cls._get_assembled_cls()(*args, **kwargs)
+        return _get_cached_assembled_cls(cls, registry)(*args, **kwargs)
 
     @classmethod
     def _wrap_pydantic_base_model_class_methods(
         metacls, namespace: Dict[str, Any]
     ) -> Dict[str, Any]:
-        new_namespace = namespace
-        from pydantic.warnings import PydanticDeprecationWarning
-
-        with warnings.catch_warnings():
-            # ignore warnings about deprecated methods into pydantic.BaseModel
-            warnings.filterwarnings("ignore", category=PydanticDeprecationWarning)
-            methods = inspect.getmembers(BaseModel, inspect.ismethod)
-            for name, method in methods:
-                if name.startswith("__"):
-                    continue
-                if name in namespace:
-                    continue
-                new_namespace[name] = metacls._wrap_class_method(
-                    cast("AnyClassmethod", method), name
-                )
-        return new_namespace
+        for name, method in _get_forwarded_class_methods().items():
+            if name not in namespace:
+                namespace[name] = method
+        return namespace
 
     ###############################################################
     # concrete methods provided to the final class by the metaclass
     ###############################################################
+    def _get_assembled_cls(
+        cls, registry: Optional[ExtendableClassesRegistry] = None
+    ) -> "ExtendableMeta":
+        assembled = super()._get_assembled_cls(registry)
+        if lazy_build:
+            _ensure_resolved(assembled, registry)
+        return assembled
+
     def _resolve_submodel_fields(
         cls, registry: Optional[ExtendableClassesRegistry] = None
     ) -> None:
         """Replace the original field type into the definition of the field by the one
-        from the registry."""
+        from the registry.
+
+        The schema of the assembled classes is not built when the class is
+        created but here, once the fields are resolved. The fields of all the
+        referenced models are resolved first and the schemas are then built in
+        the order of their dependencies so that each schema is built only once.
+
+        The class is flagged as ready once its schema is built. Until then, the
+        callers from other threads wait for the end of the resolution in
+        progress.
+        """
+        if cls.__xreg_ready__:
+            return
         registry = registry if registry else context.extendable_registry.get()
+        pending = _pending_builds.get()
+        if pending is not None:
+            # nested resolution, the build is done by the outermost call
+            cls._resolve_submodel_annotations(registry, pending)
+            return
+        with _resolve_lock:
+            # the class may have been resolved by another thread meanwhile
+            if cls.__xreg_fields_resolved__:
+                return
+            pending = []
+            token = _pending_builds.set(pending)
+            try:
+                cls._resolve_submodel_annotations(registry, pending)
+            finally:
+                _pending_builds.reset(token)
+            _build_schemas(pending)
+
+    def _resolve_submodel_annotations(
+        cls, registry: Optional[ExtendableClassesRegistry], pending: List[type]
+    ) -> None:
+        """Resolve the annotations of the fields without building the schema.
+
+        The class is appended to `pending` if its schema must be built. Since
+        the referenced models are resolved first, `pending` is filled in the
+        order of the dependencies.
+        """
         if cls.__xreg_fields_resolved__:
             return
         cls.__xreg_fields_resolved__ = True
-        to_rebuild = False
+        collector = stats.collector
+        if collector is None:
+            resolved_fields = cls._resolve_fields_annotation(registry)
+        else:
+            with collector.measure(cls, "resolve_time"):
+                resolved_fields = cls._resolve_fields_annotation(registry)
+        if resolved_fields or cls.__xreg_build_pending__:
+            pending.append(cls)
+        else:
+            cls.__xreg_ready__ = True
+
+    def _resolve_fields_annotation(
+        cls, registry: Optional[ExtendableClassesRegistry]
+    ) -> List[str]:
+        """Resolve the annotation of the fields.
+
+        Return the names of the fields whose annotation has been replaced.
+        """
+        resolved_fields: List[str] = []
         if issubclass(cls, BaseModel):
-            for field_name, field_info in cast(BaseModel, cls).model_fields.items():
+            model_cls = cast(BaseModel, cls)
+            model_fields = model_cls.model_fields
+            auto_discriminator = model_cls.model_config.get(AUTO_DISCRIMINATOR)
+            for field_name, field_info in list(model_fields.items()):
                 new_type = resolve_annotation(field_info.annotation, registry)
+                if auto_discriminator:
+                    new_type = discriminate_unions(new_type)
                 if not all_identical(field_info.annotation, new_type):
-                    cast(BaseModel, cls).model_fields[field_name] = (
-                        FieldInfo.merge_field_infos(field_info, annotation=new_type)
+                    model_fields[field_name] = FieldInfo.merge_field_infos(
+                        field_info, annotation=new_type
                     )
-                    to_rebuild = True
-        if to_rebuild:
-            delattr(cls, "__pydantic_core_schema__")
+                    resolved_fields.append(field_name)
+        if resolved_fields:
+            # the fingerprints depend on the fields of the referenced classes
+            global _fingerprint_generation
+            _fingerprint_generation += 1
+        return resolved_fields
+
+
+# Serializes the resolution of the fields and the build of the schemas. A lock
+# per class would deadlock since the resolution of a class resolves the classes
+# it references, in any order. The classes are flagged as ready once built so
+# the lock is only taken at their first use.
+_resolve_lock = threading.RLock()
+
+# True while the schemas are built, the classes being built are not ready yet
+# but must not wait for their own build.
+_building: ContextVar[bool] = ContextVar("_building", default=False)
+
+
+def _ensure_resolved(
+    cls: type, registry: Optional[ExtendableClassesRegistry] = None
+) -> None:
+    """Resolve the fields and build the schema of `cls` if not yet done.
+
+    This is used on first use of the assembled classes in `lazy_build` mode.
+    """
+    if not issubclass(type(cls), ExtendableModelMeta):
+        return
+    model_cls = cast(ExtendableModelMeta, cls)
+    if model_cls.__xreg_ready__ or _building.get():
+        return
+    registry = registry if registry else context.extendable_registry.get()
+    if registry is None or not registry.ready:
+        return
+    model_cls._resolve_submodel_fields(registry)
+
+
+# classes whose schema must be built once the resolution of the fields in
+# progress is done
+_pending_builds: ContextVar[Optional[List[type]]] = ContextVar(
+    "_pending_builds", default=None
+)
+
+
+def _build_schemas(classes: List[type]) -> None:
+    """Build the schema of `classes`, given in the order of their dependencies.
+
+    If `schema_build_workers` is greater than 1, the classes that don't depend
+    on each other are built concurrently in a thread pool.
+    """
+    token = _building.set(True)
+    try:
+        if schema_build_workers <= 1 or len(classes) <= 1:
+            for cls in classes:
+                _build_schema(cls)
+            return
+        with ThreadPoolExecutor(max_workers=schema_build_workers) as executor:
+            for level in _dependency_levels(classes):
+                # each build runs in a copy of the current context to see the
+                # current registry
+                futures = [
+                    executor.submit(copy_context().run, _build_schema, cls)
+                    for cls in level
+                ]
+                for future in futures:
+                    future.result()
+    finally:
+        _building.reset(token)
+
+
+def _build_schema(cls: type) -> None:
+    cast(ExtendableModelMeta, cls).__xreg_build_pending__ = False
+    if "__pydantic_core_schema__" in cls.__dict__:
+        delattr(cls, "__pydantic_core_schema__")
+    collector = stats.collector
+    if collector is None:
+        cast(BaseModel, cls).model_rebuild(force=True)
+    else:
+        with collector.measure(cls, "build_time"):
             cast(BaseModel, cls).model_rebuild(force=True)
+        class_stats = collector.get(cls)
+        class_stats.rebuild_count += 1
+        class_stats.core_schema_size = stats.core_schema_size(
+            cls.__dict__.get("__pydantic_core_schema__")
+        )
+    # published once the class is completely built
+    cast(ExtendableModelMeta, cls).__xreg_ready__ = True
+
+
+def _dependency_levels(classes: List[type]) -> List[List[type]]:
+    """Group `classes` by level of dependency.
+
+    The classes of a level only depend on classes of the previous levels.
+    A class depending on a class coming after it in `classes` is part of
+    a cycle. This dependency is ignored since one of the classes of the cycle
+    must be built first anyway.
+    """
+    position = {cls: i for i, cls in enumerate(classes)}
+    depth: Dict[type, int] = {}
+    levels: List[List[type]] = []
+    for i, cls in enumerate(classes):
+        level = 0
+        for field_info in cast(BaseModel, cls).model_fields.values():
+            for dep in _referenced_classes(field_info.annotation):
+                if position.get(dep, i) < i:
+                    level = max(level, depth[dep] + 1)
+        depth[cls] = level
+        if level == len(levels):
+            levels.append([])
+        levels[level].append(cls)
+    return levels
+
+
+def _referenced_classes(annotation: Any) -> Iterator[Any]:
+    """Iterate over the classes referenced into `annotation`."""
+    if isinstance(annotation, type):
+        yield annotation
+    elif isinstance(annotation, list):
+        for arg in annotation:
+            yield from _referenced_classes(arg)
+    for arg in get_args(annotation):
+        yield from _referenced_classes(arg)
 
 
 class RegistryListener(ExtendableRegistryListener):
     def on_registry_initialized(self, registry: ExtendableClassesRegistry) -> None:
-        self.resolve_submodel_fields(registry)
+        clear_registry_caches(registry)
+        if not share_assembled_classes:
+            if not lazy_build:
+                self.resolve_submodel_fields(registry)
+            return
+        # a replaced class has the same fingerprint as the class it replaces
+        fingerprints = get_registry_fingerprints(registry)
+        self.share_classes(registry, _shared_classes, fingerprints)
+        if not lazy_build:
+            self.resolve_submodel_fields(registry)
+        for name, fingerprint in fingerprints.items():
+            _shared_classes.setdefault(fingerprint, registry._extendable_classes[name])
+
+    def share_classes(
+        self,
+        registry: ExtendableClassesRegistry,
+        classes: Mapping[str, type],
+        fingerprints: Optional[Mapping[str, str]] = None,
+    ) -> bool:
+        """Replace the assembled classes of `registry` by the identical classes
+        from `classes`, a mapping of the classes by fingerprint.
+
+        `fingerprints` are the fingerprints of the classes of `registry` by
+        name (see `get_registry_fingerprints`), computed if not given.
+
+        Return True if at least one class has been replaced.
+        """
+        if fingerprints is None:
+            fingerprints = get_registry_fingerprints(registry)
+        shared = False
+        for name, fingerprint in fingerprints.items():
+            cls = registry._extendable_classes[name]
+            other_cls = classes.get(fingerprint)
+            if other_cls is not None and other_cls is not cls:
+                registry._extendable_classes[name] = cast(ExtendableMeta, other_cls)
+                shared = True
+        return shared
 
     def before_init_registry(
         self,
         registry: "ExtendableClassesRegistry",
         module_matchings: Optional[List[str]] = None,
     ) -> None:
+        clear_registry_caches(registry)
         if module_matchings is not None:
             # ensure that the current module is loaded...
             # prepend the current module to the module_matchings
@@ -129,13 +767,363 @@ class RegistryListener(ExtendableRegistryListener):
                 module_matchings.insert(0, "extendable_pydantic.models")
 
     def resolve_submodel_fields(self, registry: ExtendableClassesRegistry) -> None:
-        for cls in registry._extendable_classes.values():
-            if issubclass(type(cls), ExtendableModelMeta):
-                cast(ExtendableModelMeta, cls)._resolve_submodel_fields(registry)
+        with _resolve_lock:
+            pending: List[type] = []
+            token = _pending_builds.set(pending)
+            try:
+                for cls in registry._extendable_classes.values():
+                    if issubclass(type(cls), ExtendableModelMeta):
+                        cast(ExtendableModelMeta, cls)._resolve_submodel_fields(
+                            registry
+                        )
+            finally:
+                _pending_builds.reset(token)
+            _build_schemas(pending)
 
 
 ExtendableClassesRegistry.listeners.append(RegistryListener())
 
+
+def update_registry(
+    registry: ExtendableClassesRegistry, module_matchings: Optional[List[str]] = None
+) -> None:
+    """Update `registry` once new modules are loaded.
+
+    The class definitions of the modules matching `module_matchings` that are
+    not yet loaded into `registry` are added to it. Only the classes they
+    extend or define are assembled again, with the classes inheriting from
+    them and the classes whose fields reference them, transitively. The other
+    assembled classes are kept as is. The fields are then only resolved and
+    the schemas only built for the assembled classes.
+
+    The modules already loaded into `registry` are not loaded again: a module
+    reloaded with other class definitions requires a new registry.
+    """
+    module_matchings = module_matchings if module_matchings else ["*"]
+    for listener in registry.listeners:
+        listener.before_init_registry(registry, module_matchings)
+    with registry.build_mode(), ModuleIndex() as idx:
+        names: Set[str] = set()
+        for match in module_matchings:
+            for module in idx.get_modules(match):
+                if module in registry._loaded_modules:
+                    continue
+                names.update(
+                    class_def.name
+                    for class_def in main._extendable_class_defs_by_module[module]
+                )
+                registry.load_extendable_classes(module)
+        _rebuild_extendable_classes(registry, _impacted_classes(registry, names))
+        for listener in registry.listeners:
+            listener.on_registry_initialized(registry)
+    registry.ready = True
+
+
+def _impacted_classes(registry: ExtendableClassesRegistry, names: Set[str]) -> Set[str]:
+    """Return the names of the classes to assemble again once the classes
+    `names` are extended or defined.
+
+    These are the classes `names` and, transitively, the classes inheriting
+    from them or whose fields reference them.
+    """
+    dependents: Dict[str, Set[str]] = {}
+    for name, class_def in registry._extendable_class_defs.items():
+        for base_name in class_def.base_names:
+            dependents.setdefault(base_name, set()).add(name)
+    for name, cls in registry._extendable_classes.items():
+        for field_info in getattr(cls, "model_fields", {}).values():
+            for referenced in _referenced_classes(field_info.annotation):
+                if issubclass(type(referenced), ExtendableModelMeta):
+                    dependents.setdefault(referenced.__xreg_name__, set()).add(name)
+    impacted = set(names)
+    stack = list(names)
+    while stack:
+        for dependent in dependents.get(stack.pop(), ()):
+            if dependent not in impacted:
+                impacted.add(dependent)
+                stack.append(dependent)
+    return impacted
+
+
+def _rebuild_extendable_classes(
+    registry: ExtendableClassesRegistry, names: Set[str]
+) -> None:
+    """Assemble the classes `names` again, each one after its bases."""
+    class_defs = registry._extendable_class_defs
+    for name in names:
+        for base_name in class_defs[name].base_names:
+            if base_name not in class_defs:
+                raise TypeError(
+                    f"extendable class '{name}' inherits from undefined base "
+                    f"'{base_name}'"
+                )
+    remaining = [name for name in class_defs if name in names]
+    while remaining:
+        pending = set(remaining)
+        for name in remaining:
+            class_def = class_defs[name]
+            if not any(
+                base_name != name and base_name in pending
+                for base_name in class_def.base_names
+            ):
+                registry.build_extendable_class(class_def)
+                pending.discard(name)
+        remaining = [name for name in remaining if name in pending]
+
+
+# incremented each time the fields of a class are resolved, to invalidate the
+# fingerprints computed before
+_fingerprint_generation = 0
+
+
+def _composition(cls: type) -> str:
+    return ",".join(
+        f"{base.__module__}.{base.__qualname__}"
+        for base in cls.__mro__
+        if issubclass(type(base), ExtendableModelMeta)
+    )
+
+
+def _describe_annotation(
+    annotation: Any,
+    referenced: List[type],
+    registry: Optional[ExtendableClassesRegistry],
+) -> Any:
+    if issubclass(type(annotation), ExtendableModelMeta):
+        if registry is not None and not _is_aggregated(annotation):
+            # the registry is used directly to not trigger a lazy build
+            annotation = registry[annotation.__xreg_name__]
+        referenced.append(annotation)
+        return _composition(annotation)
+    if isinstance(annotation, list):
+        return tuple(
+            _describe_annotation(arg, referenced, registry) for arg in annotation
+        )
+    args = get_args(annotation)
+    if args:
+        return (_describe_value(get_origin(annotation)),) + tuple(
+            _describe_annotation(arg, referenced, registry) for arg in args
+        )
+    return _describe_value(annotation)
+
+
+# memory address into the default representation of the objects
+_ADDRESS = re.compile(r" at 0x[0-9a-fA-F]+")
+
+
+def _describe_value(value: Any) -> Any:
+    """Return a description of `value` stable between processes.
+
+    The functions and the classes are described by their qualified name
+    instead of their representation which contains their memory address.
+    """
+    if value is None or isinstance(value, (str, bytes, int, float)):
+        return repr(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_describe_value(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(repr(_describe_value(item)) for item in value))
+    if isinstance(value, dict):
+        return tuple(
+            sorted(
+                (repr(_describe_value(key)), _describe_value(item))
+                for key, item in value.items()
+            )
+        )
+    if isinstance(value, functools.partial):
+        return (
+            "partial",
+            _describe_value(value.func),
+            _describe_value(value.args),
+            _describe_value(value.keywords),
+        )
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        # the metadata of the fields: validators, constraints...
+        return (_describe_value(type(value)),) + tuple(
+            (field.name, _describe_value(getattr(value, field.name)))
+            for field in dataclasses.fields(value)
+        )
+    qualname = getattr(value, "__qualname__", None)
+    if isinstance(qualname, str) and callable(value):
+        return f"{getattr(value, '__module__', None)}.{qualname}"
+    return _ADDRESS.sub("", repr(value))
+
+
+def _describe_class(
+    cls: type, registry: Optional[ExtendableClassesRegistry]
+) -> Tuple[str, List[type]]:
+    """Return the description of the composition and the fields of `cls` with
+    the extendable models referenced by its fields."""
+    referenced: List[type] = []
+    fields = tuple(
+        (
+            name,
+            _describe_annotation(field_info.annotation, referenced, registry),
+            _describe_value(
+                {
+                    key: value
+                    for key, value in field_info._attributes_set.items()
+                    if key != "annotation"
+                }
+            ),
+            _describe_value(field_info.metadata),
+        )
+        for name, field_info in getattr(cls, "model_fields", {}).items()
+    )
+    return repr((_composition(cls), fields)), referenced
+
+
+def _strong_components(  # noqa: C901
+    roots: Iterable[type], references: Callable[[type], Optional[List[type]]]
+) -> Iterator[List[type]]:
+    """Iterate over the strongly connected components of the graph of the
+    classes referenced from `roots` (Tarjan's algorithm).
+
+    A component is yielded after the components it references. The classes
+    for which `references` returns None are left out of the graph.
+    """
+    index: Dict[type, int] = {}
+    lowlink: Dict[type, int] = {}
+    stack: List[type] = []
+    on_stack: Set[type] = set()
+    left_out: Set[type] = set()
+
+    def visit(cls: type) -> Optional[Iterator[type]]:
+        referenced = references(cls)
+        if referenced is None:
+            left_out.add(cls)
+            return None
+        index[cls] = lowlink[cls] = len(index)
+        stack.append(cls)
+        on_stack.add(cls)
+        return iter(referenced)
+
+    for root in roots:
+        children = None if root in index or root in left_out else visit(root)
+        work = [(root, children)] if children is not None else []
+        while work:
+            cls, children = work[-1]
+            for child in children:
+                if child in index:
+                    if child in on_stack:
+                        lowlink[cls] = min(lowlink[cls], index[child])
+                elif child not in left_out:
+                    grandchildren = visit(child)
+                    if grandchildren is not None:
+                        work.append((child, grandchildren))
+                        break
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[cls])
+                if lowlink[cls] == index[cls]:
+                    component = [stack.pop()]
+                    while component[-1] is not cls:
+                        component.append(stack.pop())
+                    on_stack.difference_update(component)
+                    yield component
+
+
+def _compute_fingerprints(
+    roots: Iterable[type], registry: Optional[ExtendableClassesRegistry]
+) -> Dict[type, str]:
+    """Return the fingerprints of `roots` and of the classes they reference.
+
+    Each class is described once. The classes referencing each other are
+    hashed together: each strongly connected component of the references is
+    hashed after the components it references.
+    """
+    generation = _fingerprint_generation
+    fingerprints: Dict[type, str] = {}
+    descriptions: Dict[type, Tuple[str, List[type]]] = {}
+
+    def references(cls: type) -> Optional[List[type]]:
+        if registry is None:
+            cached = cls.__dict__.get("__xreg_fingerprint__")
+            if cached is not None and cached[0] == generation:
+                fingerprints[cls] = cached[1]
+                return None
+        descriptions[cls] = _describe_class(cls, registry)
+        return descriptions[cls][1]
+
+    for component in _strong_components(roots, references):
+        _hash_component(component, descriptions, fingerprints)
+    if registry is None:
+        for cls in descriptions:
+            type.__setattr__(
+                cls, "__xreg_fingerprint__", (generation, fingerprints[cls])
+            )
+    return fingerprints
+
+
+def _hash_component(
+    component: List[type],
+    descriptions: Mapping[type, Tuple[str, List[type]]],
+    fingerprints: Dict[type, str],
+) -> None:
+    members = set(component)
+    component_hash = hashlib.sha256(
+        repr(
+            (
+                sorted(descriptions[cls][0] for cls in component),
+                sorted(
+                    {
+                        fingerprints[referenced]
+                        for cls in component
+                        for referenced in descriptions[cls][1]
+                        if referenced not in members
+                    }
+                ),
+            )
+        ).encode()
+    ).hexdigest()
+    for cls in component:
+        fingerprints[cls] = hashlib.sha256(
+            (component_hash + descriptions[cls][0]).encode()
+        ).hexdigest()[:16]
+
+
+def get_fingerprint(
+    cls: type, registry: Optional[ExtendableClassesRegistry] = None
+) -> str:
+    """Return a fingerprint of the extendable model `cls`.
+
+    The fingerprint covers the composition and the fields of `cls` and of all
+    the extendable models referenced by its fields, transitively. It's stable
+    between processes for classes assembled from the same class definitions:
+    the functions referenced by the fields (validators, default factories...)
+    are described by their qualified name.
+
+    If `registry` is given, the original classes referenced by the fields are
+    replaced by their assembled class into `registry`. The fingerprint of an
+    assembled class is then the same before and after the resolution of its
+    fields. Use `get_registry_fingerprints` to get the fingerprints of all the
+    classes of a registry at once.
+    """
+    return _compute_fingerprints([cls], registry)[cls]
+
+
+def get_registry_fingerprints(registry: ExtendableClassesRegistry) -> Dict[str, str]:
+    """Return the fingerprints of the extendable models of `registry` by name.
+
+    They are computed in a single pass, each class being described once.
+    """
+    classes = {
+        name: cls
+        for name, cls in registry._extendable_classes.items()
+        if issubclass(type(cls), ExtendableModelMeta)
+    }
+    fingerprints = _compute_fingerprints(classes.values(), registry)
+    return {name: fingerprints[cls] for name, cls in classes.items()}
+
+
+# assembled classes shared between the registries by fingerprint
+_shared_classes: "weakref.WeakValueDictionary[str, type]" = (
+    weakref.WeakValueDictionary()
+)
+
+
 from pydantic._internal import _generate_schema  # noqa: E402
 
 initial_type_ref = _generate_schema.get_type_ref
@@ -148,7 +1136,11 @@ def get_type_ref(
     # Ensure type_ref unicity for each extendable model
     if issubclass(type(type_), ExtendableModelMeta):
         module_name = getattr(type_, "__module__", "<No __module__>")
-        type_ref = f"{module_name}.{type_.__name__}:{id(type_)}"
+        if type_ref_strategy == "fingerprint":
+            suffix = get_fingerprint(type_)
+        else:
+            suffix = str(id(type_))
+        type_ref = f"{module_name}.{type_.__name__}:{suffix}"
     return type_ref
 
 
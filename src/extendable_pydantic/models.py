@@ -1,11 +1,155 @@
-from pydantic import BaseModel
+from typing import Any, Dict, Iterable, List, Optional, Union, overload
+
+from extendable import context
+from pydantic import BaseModel, TypeAdapter, ValidationError, WrapValidator
+from pydantic_core.core_schema import ValidatorFunctionWrapHandler
+from typing_extensions import Annotated, Literal, Self
+
+from . import main
 from .main import ExtendableModelMeta
+from .utils import get_registry_cache
+
+# name of the registry cache mapping (assembled class, collect_errors) to the
+# TypeAdapter validating a list of instances of the class
+_LIST_ADAPTERS_CACHE = "list_adapters"
+
+
+def _collect_error(value: Any, handler: ValidatorFunctionWrapHandler) -> Any:
+    """Return the validation error of an item in place of the item."""
+    try:
+        return handler(value)
+    except ValidationError as error:
+        return error
+
+
+def _new_list_adapter(cls: type, collect_errors: bool) -> TypeAdapter[List[Any]]:
+    if collect_errors:
+        return TypeAdapter(List[Annotated[cls, WrapValidator(_collect_error)]])  # type: ignore[valid-type]
+    return TypeAdapter(List[cls])  # type: ignore[valid-type]
+
+
+def _get_list_adapter(cls: type, collect_errors: bool) -> TypeAdapter[List[Any]]:
+    """Return the TypeAdapter validating a list of instances of `cls`.
+
+    The adapter validates the instances of the assembled class of `cls`. Once
+    the registry is ready, it is cached per registry.
+    """
+    registry = context.extendable_registry.get()
+    if registry is None or not registry.ready:
+        assembled = cls._get_assembled_cls(registry)  # type: ignore[attr-defined]
+        return _new_list_adapter(assembled, collect_errors)
+    if main._is_aggregated(cls):
+        assembled = cls
+    else:
+        assembled = main._get_cached_assembled_cls(cls, registry)
+    if main.lazy_build:
+        main._ensure_resolved(assembled, registry)
+    adapters = get_registry_cache(registry, _LIST_ADAPTERS_CACHE)
+    key = (assembled, collect_errors)
+    adapter: Optional[TypeAdapter[List[Any]]] = adapters.get(key)
+    if adapter is None:
+        adapter = adapters[key] = _new_list_adapter(assembled, collect_errors)
+    return adapter
 
 
 class ExtendableBaseModel(BaseModel, metaclass=ExtendableModelMeta):
     """Base class for extendable pydantic models."""
 
-    pass
+    @overload
+    @classmethod
+    def model_validate_many(
+        cls,
+        objs: Iterable[Any],
+        *,
+        strict: Optional[bool] = None,
+        from_attributes: Optional[bool] = None,
+        context: Optional[Dict[str, Any]] = None,
+        collect_errors: Literal[False] = False,
+    ) -> List[Self]: ...
+
+    @overload
+    @classmethod
+    def model_validate_many(
+        cls,
+        objs: Iterable[Any],
+        *,
+        strict: Optional[bool] = None,
+        from_attributes: Optional[bool] = None,
+        context: Optional[Dict[str, Any]] = None,
+        collect_errors: Literal[True],
+    ) -> List[Union[Self, ValidationError]]: ...
+
+    @classmethod
+    def model_validate_many(
+        cls,
+        objs: Iterable[Any],
+        *,
+        strict: Optional[bool] = None,
+        from_attributes: Optional[bool] = None,
+        context: Optional[Dict[str, Any]] = None,
+        collect_errors: bool = False,
+    ) -> List[Any]:
+        """Validate a list of objects into instances of the assembled class.
+
+        The whole list is validated by a single call to pydantic-core.
+
+        Args:
+            objs: The objects to validate.
+            strict, from_attributes, context: see `model_validate`.
+            collect_errors: If True, an invalid object doesn't abort the
+                validation of the others. Its `ValidationError` is returned
+                in place of the instance.
+
+        Raises:
+            ValidationError: If an object is invalid and `collect_errors` is
+                False. The location of the errors starts with the index of the
+                object.
+        """
+        return _get_list_adapter(cls, collect_errors).validate_python(
+            objs if isinstance(objs, list) else list(objs),
+            strict=strict,
+            from_attributes=from_attributes,
+            context=context,
+        )
+
+    @overload
+    @classmethod
+    def model_validate_json_many(
+        cls,
+        json_data: Union[str, bytes, bytearray],
+        *,
+        strict: Optional[bool] = None,
+        context: Optional[Dict[str, Any]] = None,
+        collect_errors: Literal[False] = False,
+    ) -> List[Self]: ...
+
+    @overload
+    @classmethod
+    def model_validate_json_many(
+        cls,
+        json_data: Union[str, bytes, bytearray],
+        *,
+        strict: Optional[bool] = None,
+        context: Optional[Dict[str, Any]] = None,
+        collect_errors: Literal[True],
+    ) -> List[Union[Self, ValidationError]]: ...
+
+    @classmethod
+    def model_validate_json_many(
+        cls,
+        json_data: Union[str, bytes, bytearray],
+        *,
+        strict: Optional[bool] = None,
+        context: Optional[Dict[str, Any]] = None,
+        collect_errors: bool = False,
+    ) -> List[Any]:
+        """Validate a JSON array into instances of the assembled class.
+
+        See `model_validate_many`.
+        """
+        return _get_list_adapter(cls, collect_errors).validate_json(
+            json_data, strict=strict, context=context
+        )
 
 
 class StrictExtendableBaseModel(
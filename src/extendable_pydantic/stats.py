@@ -0,0 +1,147 @@
+"""Statistics about the build of the registries.
+
+The collect of the statistics is disabled by default. When enabled, the time
+spent to assemble, resolve and build each assembled class is recorded::
+
+    from extendable_pydantic import stats
+
+    stats.enable()
+    registry.init_registry()
+    for class_stats in stats.get_registry_stats(registry).slowest(10):
+        print(class_stats)
+
+The statistics can also be printed from the command line::
+
+    python -m extendable_pydantic my.module my.other.module
+"""
+
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+from extendable.registry import ExtendableClassesRegistry
+
+
+@dataclass
+class ClassStats:
+    """Statistics about the build of an assembled class."""
+
+    name: str = ""
+    #: time spent to create the assembled class
+    assembly_time: float = 0.0
+    #: time spent to resolve the annotations of the fields (excluding the
+    #: resolution of the referenced models)
+    resolve_time: float = 0.0
+    #: time spent to build the schema, validator and serializer
+    build_time: float = 0.0
+    #: number of rebuilds of the schema
+    rebuild_count: int = 0
+    #: number of nodes into the core schema
+    core_schema_size: int = 0
+
+    @property
+    def total_time(self) -> float:
+        return self.assembly_time + self.resolve_time + self.build_time
+
+
+class RegistryStats(Dict[str, ClassStats]):
+    """Statistics of the classes of a registry by class name."""
+
+    def slowest(self, limit: Optional[int] = None) -> List[ClassStats]:
+        """Return the statistics sorted by decreasing total time."""
+        result = sorted(self.values(), key=lambda s: s.total_time, reverse=True)
+        return result[:limit] if limit is not None else result
+
+    @property
+    def total(self) -> ClassStats:
+        """Return the sum of the statistics of all the classes."""
+        total = ClassStats(name="total")
+        for class_stats in self.values():
+            total.assembly_time += class_stats.assembly_time
+            total.resolve_time += class_stats.resolve_time
+            total.build_time += class_stats.build_time
+            total.rebuild_count += class_stats.rebuild_count
+            total.core_schema_size += class_stats.core_schema_size
+        return total
+
+
+class StatsCollector:
+    def __init__(self) -> None:
+        self.classes: "weakref.WeakKeyDictionary[type, ClassStats]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._local = threading.local()
+
+    def get(self, cls: type) -> ClassStats:
+        class_stats = self.classes.get(cls)
+        if class_stats is None:
+            class_stats = self.classes.setdefault(cls, ClassStats())
+        return class_stats
+
+    @contextmanager
+    def measure(self, cls: type, attribute: str) -> Iterator[None]:
+        """Add the time spent into the block to the `attribute` of the stats of
+        `cls`. The time spent into nested measured blocks is excluded."""
+        stack: List[float] = self._local.__dict__.setdefault("stack", [])
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            class_stats = self.get(cls)
+            setattr(
+                class_stats,
+                attribute,
+                getattr(class_stats, attribute) + elapsed - nested,
+            )
+
+
+# The current collector. None if the collect is disabled.
+collector: Optional[StatsCollector] = None
+
+
+def enable() -> None:
+    """Start collecting statistics."""
+    global collector
+    if collector is None:
+        collector = StatsCollector()
+
+
+def disable() -> None:
+    """Stop collecting statistics and drop the collected ones."""
+    global collector
+    collector = None
+
+
+def core_schema_size(schema: Any) -> int:
+    """Return the number of nodes into a core schema."""
+    size = 0
+    to_visit = [schema]
+    while to_visit:
+        node = to_visit.pop()
+        if isinstance(node, dict):
+            size += 1
+            to_visit.extend(node.values())
+        elif isinstance(node, (list, tuple)):
+            to_visit.extend(node)
+    return size
+
+
+def get_registry_stats(registry: ExtendableClassesRegistry) -> RegistryStats:
+    """Return the statistics collected for the classes of `registry`."""
+    result = RegistryStats()
+    if collector is None:
+        return result
+    for name, cls in registry._extendable_classes.items():
+        class_stats = collector.classes.get(cls)
+        if class_stats is not None:
+            class_stats.name = name
+            result[name] = class_stats
+    return result
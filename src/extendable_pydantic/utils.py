@@ -3,14 +3,23 @@ from __future__ import annotations
 import sys
 import types
 import typing
+import weakref
 from itertools import zip_longest
-from typing import Any, List, Optional
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, cast
 
 import typing_extensions
 from extendable import context
 from extendable.main import ExtendableMeta
 from extendable.registry import ExtendableClassesRegistry
-from typing_extensions import get_args, get_origin
+from pydantic import BaseModel, Field
+from pydantic.fields import FieldInfo
+from typing_extensions import OrderedDict, get_args, get_origin
+
+try:
+    # pydantic >= 2.5
+    from pydantic import Discriminator
+except ImportError:  # pragma: no cover
+    Discriminator = None  # type: ignore[assignment,misc,unused-ignore]
 
 try:
     from typing import _TypingBase  # type: ignore[attr-defined,unused-ignore]
@@ -24,6 +33,91 @@ if sys.version_info >= (3, 10):
 typing_base = _TypingBase
 _EMPTY = object()
 
+# Caches attached to a registry. They are dropped when the registry is
+# (re)initialized or garbage collected.
+_registry_caches: (
+    "weakref.WeakKeyDictionary[ExtendableClassesRegistry, Dict[str, Dict[Any, Any]]]"
+) = weakref.WeakKeyDictionary()
+
+
+# Maximum number of resolved annotations kept per registry
+resolve_annotation_cache_size = 4096
+
+_RESOLVE_ANNOTATION_CACHE = "resolve_annotation"
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache(OrderedDict[Any, Any]):
+    """A mapping bounded to `maxsize` items with a LRU eviction policy.
+
+    Only the accesses through `lookup` and `store` update the order of the
+    items and the counters of hits, misses and evictions.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        super().__init__()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, key: Any, default: Any = None) -> Any:
+        try:
+            value = self[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        try:
+            self.move_to_end(key)
+        except KeyError:  # evicted by another thread
+            pass
+        self.hits += 1
+        return value
+
+    def store(self, key: Any, value: Any) -> None:
+        self[key] = value
+        while len(self) > self.maxsize:
+            try:
+                self.popitem(last=False)
+            except KeyError:  # pragma: no cover
+                break
+            self.evictions += 1
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(
+            self.hits, self.misses, self.evictions, self.maxsize, len(self)
+        )
+
+
+def get_registry_cache(
+    registry: ExtendableClassesRegistry,
+    name: str,
+    factory: Callable[[], Dict[Any, Any]] = dict,
+) -> Dict[Any, Any]:
+    """Return the cache `name` attached to `registry`.
+
+    The cache is created by calling `factory` on first access.
+    """
+    caches = _registry_caches.get(registry)
+    if caches is None:
+        caches = _registry_caches.setdefault(registry, {})
+    cache = caches.get(name)
+    if cache is None:
+        cache = caches.setdefault(name, factory())
+    return cache
+
+
+def clear_registry_caches(registry: ExtendableClassesRegistry) -> None:
+    """Drop all the caches attached to `registry`."""
+    _registry_caches.pop(registry, None)
+
 
 def all_identical(left: Optional[Any], right: Optional[Any]) -> bool:
     """Check that the items of `left` are the same objects as those in `right`.
@@ -45,7 +139,7 @@ def all_identical(left: Optional[Any], right: Optional[Any]) -> bool:
     return True
 
 
-def resolve_annotation(  # noqa: C901
+def resolve_annotation(
     type_: Any, registry: Optional[ExtendableClassesRegistry] = None
 ) -> Any:
     """Return type with all occurrences of subclass of `ExtendableModelMeta` keys
@@ -69,9 +163,40 @@ def resolve_annotation(  # noqa: C901
     Credits: Inspired from pydantic._internal._generics.replace_types
 
     see (https://github.com/pydantic/pydantic/blob/main/pydantic/_internal/_generics.py#L257C5-L257C18)
+
+    Once the registry is ready, the result is cached per registry with a LRU
+    policy. The cache is dropped when the registry is initialized again.
     """
     registry = registry if registry else context.extendable_registry.get()
+    if registry is None or not registry.ready:
+        return _resolve_annotation(type_, registry)
+    cache = cast(
+        LRUCache,
+        get_registry_cache(
+            registry,
+            _RESOLVE_ANNOTATION_CACHE,
+            lambda: LRUCache(resolve_annotation_cache_size),
+        ),
+    )
+    key = id(type_)
+    entry = cache.lookup(key)
+    # the annotation is kept in the entry so its id can't be reused
+    if entry is not None and entry[0] is type_:
+        return entry[1]
+    resolved = _resolve_annotation(type_, registry)
+    cache.store(key, (type_, resolved))
+    return resolved
+
 
+def _is_parametrized(cls: type) -> bool:
+    """Return True if `cls` is a parametrized generic (e.g. `Model[int]`)."""
+    metadata = cls.__dict__.get("__pydantic_generic_metadata__")
+    return bool(metadata and metadata.get("origin") is not None)
+
+
+def _resolve_annotation(  # noqa: C901
+    type_: Any, registry: Optional[ExtendableClassesRegistry]
+) -> Any:
     type_args = get_args(type_)
     origin_type = get_origin(type_)
 
@@ -113,7 +238,14 @@ def resolve_annotation(  # noqa: C901
     # semantics as "typing" classes or generic aliases
 
     if not origin_type and issubclass(type(type_), ExtendableMeta):
-        final_type = type_._get_assembled_cls(registry)
+        if registry is not None and _is_parametrized(type_):
+            # a generic parametrized once the registry is initialized is
+            # assembled on demand
+            from .main import _get_cached_assembled_cls
+
+            final_type: Any = _get_cached_assembled_cls(type_, registry)
+        else:
+            final_type = type_._get_assembled_cls(registry)
         if final_type is not type_:
             final_type._resolve_submodel_fields(registry)
         return final_type
@@ -127,3 +259,110 @@ def resolve_annotation(  # noqa: C901
         return resolved_list
 
     return type_
+
+
+_LITERAL_TYPES: typing.Set[Any] = {typing_extensions.Literal}
+if sys.version_info >= (3, 8):
+    _LITERAL_TYPES.add(typing.Literal)
+
+
+def _is_union(origin_type: Any) -> bool:
+    if origin_type is typing.Union:
+        return True
+    return sys.version_info >= (3, 10) and origin_type is types.UnionType
+
+
+def _has_discriminator(metadata: Any) -> bool:
+    if Discriminator is not None and isinstance(metadata, Discriminator):
+        return True
+    return isinstance(metadata, FieldInfo) and metadata.discriminator is not None
+
+
+def find_discriminator(models: List[type]) -> Optional[str]:
+    """Return the name of a field usable to discriminate `models`.
+
+    The field must be required and annotated with a `Literal` into each model
+    and the literal values of the models must be disjoint. A field with a
+    default value isn't used since the inputs without this field would be
+    rejected by the tagged union.
+    """
+    candidates: Optional[List[str]] = None
+    for model in models:
+        names = [
+            name
+            for name, field_info in model.model_fields.items()  # type: ignore[attr-defined]
+            if get_origin(field_info.annotation) in _LITERAL_TYPES
+            and field_info.is_required()
+        ]
+        candidates = (
+            names if candidates is None else [n for n in candidates if n in names]
+        )
+    for name in candidates or ():
+        seen: typing.Set[Any] = set()
+        for model in models:
+            values = set(get_args(model.model_fields[name].annotation))  # type: ignore[attr-defined]
+            if seen & values:
+                break
+            seen |= values
+        else:
+            return name
+    return None
+
+
+def _tag_union(members: typing.Tuple[Any, ...]) -> Any:
+    """Return the tagged union of `members` or None if it can't be tagged."""
+    models = [
+        member
+        for member in members
+        if isinstance(member, type) and issubclass(member, BaseModel)
+    ]
+    others = [member for member in members if member not in models]
+    if len(models) < 2 or any(member is not type(None) for member in others):
+        return None
+    name = find_discriminator(models)
+    if name is None:
+        return None
+    tagged: Any = typing_extensions.Annotated[
+        typing.Union[tuple(models)], Field(discriminator=name)
+    ]
+    return typing.Optional[tagged] if others else tagged
+
+
+def discriminate_unions(type_: Any) -> Any:
+    """Return type with the unions of pydantic models replaced by tagged unions.
+
+    A union is tagged if all its members (`None` apart) are pydantic models
+    sharing a `Literal` field with disjoint values (see `find_discriminator`).
+    The unions already having a discriminator are left untouched.
+
+    ```py
+    discriminate_unions(List[Union[Cat, Dog]])
+    #> List[Annotated[Union[Cat, Dog], Field(discriminator="kind")]]
+    ```
+    """
+    type_args = get_args(type_)
+    origin_type = get_origin(type_)
+    if not type_args or origin_type is None:
+        return type_
+    if origin_type is typing_extensions.Annotated:
+        annotated_type, *metadata = type_args
+        if any(_has_discriminator(item) for item in metadata):
+            return type_
+        new_type = discriminate_unions(annotated_type)
+        if new_type is annotated_type:
+            return type_
+        return typing_extensions.Annotated[(new_type, *metadata)]
+    new_args = tuple(discriminate_unions(arg) for arg in type_args)
+    if _is_union(origin_type):
+        tagged = _tag_union(new_args)
+        if tagged is not None:
+            return tagged
+        if all_identical(type_args, new_args):
+            return type_
+        return typing.Union[new_args]
+    if all_identical(type_args, new_args):
+        return type_
+    try:
+        return origin_type[new_args]
+    except TypeError:  # not subscriptable (e.g. typing.Callable arguments)
+        return type_
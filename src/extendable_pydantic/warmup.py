@@ -0,0 +1,85 @@
+"""Warm-up of the registries before forking worker processes."""
+
+import gc
+from typing import Any, Iterable, Optional, cast
+
+from extendable import context
+from extendable.registry import ExtendableClassesRegistry
+from pydantic import BaseModel
+
+from .main import ExtendableModelMeta, _get_generics_cache
+
+
+def _build_routes(app: Any) -> None:
+    # Recent fastapi versions build the routes of the included routers on their
+    # first use (the fields, type adapters and param annotations of each route).
+    # They're built by the generation of the OpenAPI schema too, but not when
+    # the schema is assigned by the app itself.
+    try:
+        from fastapi.routing import iter_route_contexts
+    except ImportError:  # the routes are built when they are added
+        return
+    for _route_context in iter_route_contexts(app.routes):
+        pass
+
+
+def warm_registry(
+    registry: Optional[ExtendableClassesRegistry] = None,
+    apps: Iterable[Any] = (),
+    freeze_gc: bool = False,
+) -> None:
+    """Force the build of the state lazily built for the assembled classes.
+
+    This method is intended to be called into the parent process of a prefork
+    server once the registry is initialized. The children then share the
+    built state with their parent instead of building it on their first
+    requests.
+
+    * the fields referencing other extendable models are resolved and the
+      schema, validator and serializer of each assembled class are built,
+      including the parametrized generics already assembled for the registry;
+    * the routes of each given FastAPI application are built (their fields,
+      type adapters and param annotations);
+    * the OpenAPI schema of each given FastAPI application is generated and
+      cached for the registry. (The JSON schemas generated by pydantic are
+      not kept, the OpenAPI schema is the only one that is worth building in
+      advance.)
+
+    The generics parametrized for the first time after the warm-up (e.g. into
+    the code of a route) are still assembled on demand, and the routes added
+    afterwards are built on their first use.
+
+    Args:
+        registry: The registry to warm up. Defaults to the current registry.
+        apps: The FastAPI applications serving the registry.
+        freeze_gc: If True, `gc.freeze()` is called at the end so that the
+            objects built by the parent are never touched by the garbage
+            collector of the children and stay shared copy-on-write.
+    """
+    registry = registry if registry else context.extendable_registry.get()
+    if registry is None:
+        raise ValueError("No registry to warm up")
+    token = context.extendable_registry.set(registry)
+    try:
+        classes = [
+            cls
+            for cls in registry._extendable_classes.values()
+            if issubclass(type(cls), ExtendableModelMeta)
+        ]
+        classes.extend(_get_generics_cache(registry).values())
+        for cls in classes:
+            cast(ExtendableModelMeta, cls)._resolve_submodel_fields(registry)
+        for cls in classes:
+            if not issubclass(cls, BaseModel):
+                continue
+            model_cls = cast(BaseModel, cls)
+            if not model_cls.__pydantic_complete__:
+                model_cls.model_rebuild(force=True)
+        for app in apps:
+            _build_routes(app)
+            app.openapi()
+    finally:
+        context.extendable_registry.reset(token)
+    if freeze_gc:
+        gc.collect()
+        gc.freeze()
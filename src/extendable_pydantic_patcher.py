@@ -0,0 +1,47 @@
+"""Load the FastAPI integration of extendable_pydantic when fastapi is imported.
+
+This module is imported at the startup of every python interpreter by
+``extendable_pydantic_patcher.pth``. It must therefore stay cheap to import: it
+only installs a meta path finder and the patches, with their dependencies, are
+imported the first time ``fastapi`` is imported. At this time, the python path
+is complete and the dependencies can be found.
+"""
+
+import sys
+
+_TRIGGER = "fastapi"
+
+
+class _PatcherFinder:
+    """Meta path finder importing the patches before fastapi is imported.
+
+    The finder doesn't find anything, it lets the other finders import
+    fastapi.
+    """
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname == _TRIGGER:
+            uninstall()
+            import extendable_pydantic._patch  # noqa: F401
+        return None
+
+
+_finder = _PatcherFinder()
+
+
+def install():
+    """Import the patches once fastapi is imported."""
+    if _TRIGGER in sys.modules:
+        import extendable_pydantic._patch  # noqa: F401
+    elif _finder not in sys.meta_path:
+        sys.meta_path.insert(0, _finder)
+
+
+def uninstall():
+    try:
+        sys.meta_path.remove(_finder)
+    except ValueError:
+        pass
+
+
+install()
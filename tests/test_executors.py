@@ -0,0 +1,77 @@
+"""Test the executors binding a registry."""
+
+import asyncio
+import multiprocessing
+from typing import Any, Dict
+
+from extendable import context
+
+from extendable_pydantic import ExtendableBaseModel
+from extendable_pydantic.executors import (
+    RegistryProcessPoolExecutor,
+    RegistryThreadPoolExecutor,
+    bind_registry,
+)
+
+
+def _validate_base(data: Dict[str, Any]) -> Dict[str, Any]:
+    from tests.modtest.base import Base
+
+    return Base(**data).model_dump()
+
+
+def _has_registry(_: Any) -> bool:
+    return context.extendable_registry.get() is not None
+
+
+def test_thread_pool_executor(test_registry):
+    class Location(ExtendableBaseModel):
+        name: str
+
+    class LocationExtended(Location, extends=True):
+        lat: float = 0.1
+
+    test_registry.init_registry()
+    with RegistryThreadPoolExecutor(2) as executor:
+        locations = list(executor.map(lambda name: Location(name=name), "abc"))
+        assert executor.submit(context.extendable_registry.get).result() is (
+            test_registry
+        )
+    assert [location.model_dump() for location in locations] == [
+        {"name": name, "lat": 0.1} for name in "abc"
+    ]
+
+
+def test_bind_registry(test_registry):
+    class Location(ExtendableBaseModel):
+        name: str
+
+    class LocationExtended(Location, extends=True):
+        lat: float = 0.1
+
+    test_registry.init_registry()
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        unbound = await loop.run_in_executor(None, context.extendable_registry.get)
+        bound = await loop.run_in_executor(
+            None, bind_registry(lambda: Location(name="a"))
+        )
+        return unbound, bound
+
+    unbound, bound = asyncio.run(run())
+    assert unbound is None
+    assert isinstance(bound, LocationExtended)
+
+
+def test_process_pool_executor():
+    with RegistryProcessPoolExecutor(
+        2,
+        modules=["tests.modtest.base"],
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
+        results = list(
+            executor.map(_validate_base, [{"x": "a", "myList": [], "y": "b"}] * 4)
+        )
+        assert all(executor.map(_has_registry, range(8)))
+    assert results == [{"x": "a", "myList": [], "y": "b"}] * 4
@@ -1,11 +1,29 @@
-from typing import Generic, List, TypeVar
+import importlib
+import os
+import pickle
+import subprocess
+import sys
+import textwrap
+from typing import Generic, List, Optional, TypeVar
 
 try:
     from typing import Literal
 except ImportError:
     from typing_extensions import Literal
 
-from extendable_pydantic import ExtendableBaseModel
+import pytest
+from extendable import context, registry
+
+from pydantic import BaseModel, PrivateAttr, ValidationError, field_validator
+
+from extendable_pydantic import ExtendableBaseModel, ExtendableModelMeta
+from extendable_pydantic import main as extendable_pydantic_main
+from extendable_pydantic.main import (
+    get_fingerprint,
+    get_registry_fingerprints,
+    get_type_ref,
+)
+from extendable_pydantic.utils import get_registry_cache
 
 from .conftest import skip_not_supported_version_for_generics
 
@@ -117,3 +135,424 @@ def test_generics_of_extended_base_model_import_module(test_registry):
         "total": 0,
         "results": [{"kind": "view", "my_list": ["a", "b"], "name": "name"}],
     }
+
+
+def test_instantiation_dispatch_per_registry(test_registry):
+    class MyModel(ExtendableBaseModel):
+        x: str
+
+    class MyModelExtended(MyModel, extends=True):
+        y: str = "y"
+
+    test_registry.init_registry()
+    other_registry = registry.ExtendableClassesRegistry()
+    token = context.extendable_registry.set(other_registry)
+    try:
+        other_registry.init_registry()
+        other = MyModel(x="a")
+    finally:
+        context.extendable_registry.reset(token)
+    # the assembled class is cached per registry
+    for _i in range(2):
+        instance = MyModel(x="a")
+        assert type(instance) is test_registry[MyModel.__xreg_name__]
+    assert type(other) is other_registry[MyModel.__xreg_name__]
+    assert type(other) is not type(instance)
+    assert other.model_dump() == instance.model_dump() == {"x": "a", "y": "y"}
+
+
+def test_class_methods_forwarded_to_assembled_class(test_registry):
+    class MyModel(ExtendableBaseModel):
+        x: str
+
+    class MyModelExtended(MyModel, extends=True):
+        y: str = "y"
+
+    test_registry.init_registry()
+    assembled = test_registry[MyModel.__xreg_name__]
+    for _i in range(2):
+        instance = MyModel.model_validate_json('{"x": "a"}')
+        assert type(instance) is assembled
+        assert instance.model_dump() == {"x": "a", "y": "y"}
+    assert type(MyModel.model_construct(x="a")) is assembled
+    assert MyModel.model_json_schema() == assembled.model_json_schema()
+
+
+def test_original_class_build_deferred(test_registry):
+    class MyModel(ExtendableBaseModel):
+        x: str
+
+    class MyModelExtended(MyModel, extends=True):
+        y: str = "y"
+
+    assert not MyModel.__pydantic_complete__
+    assert not MyModelExtended.__pydantic_complete__
+    assert "defer_build" not in MyModel.model_config
+    test_registry.init_registry()
+    assembled = test_registry[MyModel.__xreg_name__]
+    assert assembled.__pydantic_complete__
+    assert MyModel(x="a").model_dump() == {"x": "a", "y": "y"}
+
+
+def test_original_class_explicit_defer_build(test_registry):
+    class MyModel(ExtendableBaseModel, defer_build=False):
+        x: str
+
+    assert MyModel.__pydantic_complete__
+    assert MyModel.model_config["defer_build"] is False
+
+
+def test_fingerprint_type_ref(test_registry, monkeypatch):
+    monkeypatch.setattr(extendable_pydantic_main, "type_ref_strategy", "fingerprint")
+
+    class Child(ExtendableBaseModel):
+        x: str
+
+    class Parent(ExtendableBaseModel):
+        child: Child
+
+    test_registry.init_registry()
+    other_registry = registry.ExtendableClassesRegistry()
+    other_registry.init_registry()
+    parent = test_registry[Parent.__xreg_name__]
+    other_parent = other_registry[Parent.__xreg_name__]
+    assert parent is not other_parent
+    assert get_type_ref(parent) == get_type_ref(other_parent)
+    assert parent.model_json_schema() == other_parent.model_json_schema()
+
+    class ChildExtended(Child, extends=True):
+        y: str
+
+    extended_registry = registry.ExtendableClassesRegistry()
+    extended_registry.init_registry()
+    extended_parent = extended_registry[Parent.__xreg_name__]
+    assert get_type_ref(extended_parent) != get_type_ref(parent)
+    assert extended_parent(child={"x": "a", "y": "b"}).child.y == "b"
+
+
+def test_registry_fingerprints(test_registry):
+    class Node(ExtendableBaseModel):
+        children: List["Node"] = []
+
+    class Tree(ExtendableBaseModel):
+        root: Optional[Node] = None
+
+    class Tag(ExtendableBaseModel):
+        name: str
+
+    test_registry.init_registry()
+    fingerprints = get_registry_fingerprints(test_registry)
+    for cls in (Node, Tree, Tag):
+        assert fingerprints[cls.__xreg_name__] == get_fingerprint(
+            test_registry[cls.__xreg_name__], test_registry
+        )
+    assert len(set(fingerprints.values())) == len(fingerprints)
+
+    class NodeExtended(Node, extends=True):
+        name: str = ""
+
+    other_registry = registry.ExtendableClassesRegistry()
+    other_registry.init_registry()
+    other_fingerprints = get_registry_fingerprints(other_registry)
+    assert other_fingerprints[Tag.__xreg_name__] == fingerprints[Tag.__xreg_name__]
+    # the extension of the node is seen through the reference cycle
+    assert other_fingerprints[Tree.__xreg_name__] != fingerprints[Tree.__xreg_name__]
+
+
+_FINGERPRINT_MODULE = """
+from typing import List
+
+from pydantic import AfterValidator, Field
+from typing_extensions import Annotated
+
+from extendable_pydantic import ExtendableBaseModel
+
+
+def _strip(value: str) -> str:
+    return value.strip()
+
+
+class Child(ExtendableBaseModel):
+    name: Annotated[str, AfterValidator(_strip)]
+    tags: List[str] = Field(default_factory=lambda: ["a"])
+
+
+class Parent(ExtendableBaseModel):
+    child: Child
+"""
+
+_FINGERPRINT_SCRIPT = """
+from extendable import context, registry
+from extendable_pydantic import main
+import xreg_fingerprint
+
+main.type_ref_strategy = "fingerprint"
+_registry = registry.ExtendableClassesRegistry()
+context.extendable_registry.set(_registry)
+_registry.init_registry(["xreg_fingerprint"])
+parent = _registry[xreg_fingerprint.Parent.__xreg_name__]
+print(main.get_type_ref(parent), main.get_fingerprint(parent, _registry))
+"""
+
+
+def test_fingerprint_stable_between_processes(tmp_path):
+    (tmp_path / "xreg_fingerprint.py").write_text(textwrap.dedent(_FINGERPRINT_MODULE))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(tmp_path), env.get("PYTHONPATH")])
+    )
+    outputs = [
+        subprocess.run(
+            [sys.executable, "-c", _FINGERPRINT_SCRIPT],
+            capture_output=True,
+            text=True,
+            env=env,
+            check=True,
+        ).stdout
+        for _ in range(2)
+    ]
+    assert outputs[0]
+    assert outputs[0] == outputs[1]
+
+
+def test_share_assembled_classes(test_registry, monkeypatch):
+    monkeypatch.setattr(extendable_pydantic_main, "share_assembled_classes", True)
+
+    class Child(ExtendableBaseModel):
+        x: str
+
+    class Parent(ExtendableBaseModel):
+        child: Child
+
+    test_registry.init_registry()
+    child = test_registry[Child.__xreg_name__]
+    parent = test_registry[Parent.__xreg_name__]
+    other_registry = registry.ExtendableClassesRegistry()
+    other_registry.init_registry()
+    assert other_registry[Child.__xreg_name__] is child
+    assert other_registry[Parent.__xreg_name__] is parent
+
+    class ParentExtended(Parent, extends=True):
+        y: str = "y"
+
+    extended_registry = registry.ExtendableClassesRegistry()
+    extended_registry.init_registry()
+    extended_parent = extended_registry[Parent.__xreg_name__]
+    assert extended_parent is not parent
+    assert extended_registry[Child.__xreg_name__] is child
+    assert extended_parent.model_fields["child"].annotation is child
+    token = context.extendable_registry.set(extended_registry)
+    try:
+        instance = Parent(child={"x": "a"})
+    finally:
+        context.extendable_registry.reset(token)
+    assert type(instance) is extended_parent
+    assert type(instance.child) is child
+    assert instance.y == "y"
+
+
+def test_forwarded_class_methods_shared(test_registry):
+    class MyModel(BaseModel, metaclass=ExtendableModelMeta):
+        x: str
+
+    class MyOtherModel(BaseModel, metaclass=ExtendableModelMeta):
+        y: str
+
+    forwarded = MyModel.__dict__["model_validate"]
+    assert MyOtherModel.__dict__["model_validate"] is forwarded
+    test_registry.init_registry()
+    assert (
+        type(MyModel.model_validate({"x": "a"})) is test_registry[MyModel.__xreg_name__]
+    )
+
+
+def test_class_method_into_registry_listener(test_registry):
+    class MyModel(ExtendableBaseModel):
+        x: int = 0
+
+    class MyModelExtended(MyModel, extends=True):
+        y: int = 1
+
+    instances = []
+
+    class Listener(registry.ExtendableRegistryListener):
+        def on_registry_initialized(self, reg):
+            instances.append(MyModel.model_validate({}))
+
+    listener = Listener()
+    registry.ExtendableClassesRegistry.listeners.append(listener)
+    try:
+        test_registry.init_registry()
+    finally:
+        registry.ExtendableClassesRegistry.listeners.remove(listener)
+    # the registry is not ready yet, the method is forwarded to the assembled
+    # class anyway
+    assert type(instances[0]) is test_registry[MyModel.__xreg_name__]
+    assert instances[0].model_dump() == {"x": 0, "y": 1}
+
+
+def test_pickle_by_reference(test_registry):
+    validations = []
+
+    class Child(ExtendableBaseModel):
+        x: str
+
+        @field_validator("x")
+        @classmethod
+        def _check_x(cls, value: str) -> str:
+            validations.append(value)
+            return value
+
+    class Parent(ExtendableBaseModel):
+        children: List[Child] = []
+        _note: str = PrivateAttr("")
+
+    class ChildExtended(Child, extends=True):
+        y: str = "y"
+
+    test_registry.init_registry()
+    parent = Parent(children=[{"x": "a"}])
+    parent._note = "note"
+    validations.clear()
+    data = pickle.dumps(parent)
+    # instances are restored into the current registry
+    other_registry = registry.ExtendableClassesRegistry()
+    token = context.extendable_registry.set(other_registry)
+    try:
+        other_registry.init_registry()
+        restored = pickle.loads(data)
+    finally:
+        context.extendable_registry.reset(token)
+    assert type(restored) is other_registry[Parent.__xreg_name__]
+    assert type(restored.children[0]) is other_registry[Child.__xreg_name__]
+    assert restored.model_dump() == {"children": [{"x": "a", "y": "y"}]}
+    assert restored.model_fields_set == {"children"}
+    assert restored._note == "note"
+    assert not validations
+    # the private attributes set by extendable are restored from the class
+    assert restored._is_aggregated_class
+    assert restored.model_copy().model_dump() == restored.model_dump()
+
+    token = context.extendable_registry.set(None)
+    try:
+        with pytest.raises(pickle.UnpicklingError):
+            pickle.loads(data)
+    finally:
+        context.extendable_registry.reset(token)
+
+
+_GENERICS_MODULE = """
+from typing import Generic, List, TypeVar
+
+from extendable_pydantic import ExtendableBaseModel
+
+T = TypeVar("T")
+
+
+class SearchResult(ExtendableBaseModel, Generic[T]):
+    total: int
+    results: List[T]
+
+
+class Location(ExtendableBaseModel):
+    name: str
+
+
+class LocationExtended(Location, extends=True):
+    lat: float = 0.1
+
+
+LocationResult = SearchResult[Location]
+"""
+
+
+@skip_not_supported_version_for_generics
+def test_pickle_generic_by_reference(test_registry, tmp_path, monkeypatch):
+    (tmp_path / "xreg_pickle_generics.py").write_text(_GENERICS_MODULE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    try:
+        models = importlib.import_module("xreg_pickle_generics")
+        test_registry.init_registry(["xreg_pickle_generics"])
+        location_result = models.LocationResult(total=1, results=[{"name": "a"}])
+        # parametrized once the registry is initialized
+        int_result = models.SearchResult[int](total=1, results=[1])
+        data = pickle.dumps([location_result, int_result])
+        other_registry = registry.ExtendableClassesRegistry()
+        token = context.extendable_registry.set(other_registry)
+        try:
+            other_registry.init_registry(["xreg_pickle_generics"])
+            restored_location, restored_int = pickle.loads(data)
+            assert (
+                type(restored_location)
+                is other_registry[models.LocationResult.__xreg_name__]
+            )
+            assert type(restored_int) is (
+                extendable_pydantic_main._get_cached_assembled_cls(
+                    models.SearchResult[int], other_registry
+                )
+            )
+        finally:
+            context.extendable_registry.reset(token)
+    finally:
+        sys.modules.pop("xreg_pickle_generics", None)
+    assert (
+        type(restored_location.results[0])
+        is other_registry[models.Location.__xreg_name__]
+    )
+    assert restored_location.model_dump() == {
+        "total": 1,
+        "results": [{"name": "a", "lat": 0.1}],
+    }
+    assert restored_int.model_dump() == {"total": 1, "results": [1]}
+
+
+def test_model_validate_many(test_registry):
+    class MyModel(ExtendableBaseModel):
+        x: int
+
+    class MyModelExtended(MyModel, extends=True):
+        y: str = "y"
+
+    test_registry.init_registry()
+    assembled = test_registry[MyModel.__xreg_name__]
+    instances = MyModel.model_validate_many([{"x": 1}, {"x": 2, "y": "b"}])
+    assert [type(instance) for instance in instances] == [assembled, assembled]
+    assert [instance.model_dump() for instance in instances] == [
+        {"x": 1, "y": "y"},
+        {"x": 2, "y": "b"},
+    ]
+    instances = MyModel.model_validate_json_many('[{"x": 1}, {"x": 2}]')
+    assert [instance.x for instance in instances] == [1, 2]
+    # the adapter is cached per registry
+    assert MyModel.model_validate_many(iter([{"x": 3}]))[0].x == 3
+    adapters = get_registry_cache(test_registry, "list_adapters")
+    assert list(adapters) == [(assembled, False)]
+
+    with pytest.raises(ValidationError) as error:
+        MyModel.model_validate_many([{"x": 1}, {"x": "a"}])
+    assert error.value.errors()[0]["loc"] == (1, "x")
+    results = MyModel.model_validate_json_many(
+        '[{"x": 1}, {"x": "a"}, {"x": 3}]', collect_errors=True
+    )
+    assert [result.x for result in results[::2]] == [1, 3]
+    assert isinstance(results[1], ValidationError)
+    assert results[1].errors()[0]["loc"] == ("x",)
+
+
+def test_class_methods_of_class_not_in_registry(test_registry):
+    class MyModel(ExtendableBaseModel):
+        x: str
+
+    test_registry.init_registry()
+
+    class MyOtherModel(ExtendableBaseModel):
+        y: str
+
+    # the class is defined once the registry is initialized, the methods are
+    # bound to the class itself
+    instance = MyOtherModel.model_validate({"y": "a"})
+    assert type(instance) is MyOtherModel
+    assert MyOtherModel.model_json_schema()["required"] == ["y"]
+    assert (
+        type(MyModel.model_validate({"x": "a"})) is test_registry[MyModel.__xreg_name__]
+    )
@@ -1,5 +1,25 @@
 """Test fastapi integration."""
 
+import sys
+
+if sys.version_info >= (3, 9):
+    from typing import Annotated
+else:
+    from typing_extensions import Annotated
+
+from typing import Generic, List, TypeVar
+
+from extendable import context, registry
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic.fields import FieldInfo
+from typing_extensions import get_args, get_origin
+
+from extendable_pydantic import ExtendableBaseModel, _patch, warm_registry
+from extendable_pydantic.utils import get_registry_cache, resolve_annotation
+
+from .conftest import skip_not_supported_version_for_generics
+
 
 def test_open_api_schema(test_fastapi):
     client = test_fastapi
@@ -55,3 +75,136 @@ def test_extended_request_with_params(test_fastapi):
     response = client.get("/extended", params={"name": "echo", "id": 3})
     assert response.status_code == 200
     assert response.json() == {"name": "echo", "id": 3}
+
+
+def test_warm_registry_openapi(test_fastapi, test_registry):
+    app = test_fastapi.app
+    warm_registry(test_registry, apps=[app])
+    assert app.openapi_schema is not None
+    response = test_fastapi.get("/openapi.json")
+    assert response.json() == app.openapi_schema
+
+
+def test_type_adapters_shared(test_fastapi, test_registry):
+    # recent fastapi versions only build the fields of the included routes
+    # when they are first used
+    test_fastapi.get("/")
+    test_fastapi.post("/", json={})
+    test_fastapi.get("/extended")
+    adapters = get_registry_cache(test_registry, "type_adapters")
+    models = [key[0] for key in adapters]
+    # one adapter per distinct model, the response model of the 3 routes
+    assert len(models) == len(set(models))
+    assert [model.__xreg_name__ for model in models] == [
+        "tests.conftest.test_fastapi.<locals>.TestResponse"
+    ]
+
+
+def test_field_info_key_unhashable_values():
+    field_infos = [FieldInfo(examples=[{"x": i}]) for i in range(200)]
+    keys = {_patch._field_info_key(field_info) for field_info in field_infos}
+    assert len(keys) == 200
+    assert _patch._field_info_key(FieldInfo(examples=[1])) == (
+        _patch._field_info_key(FieldInfo(examples=[1]))
+    )
+
+
+def test_openapi_cached_per_registry(test_fastapi, test_registry):
+    app = test_fastapi.app
+    schema = app.openapi()
+    assert app.openapi() is schema
+
+    other_registry = registry.ExtendableClassesRegistry()
+    other_registry.init_registry()
+    token = context.extendable_registry.set(other_registry)
+    try:
+        other_schema = app.openapi()
+    finally:
+        context.extendable_registry.reset(token)
+    assert other_schema is not schema
+    assert other_schema == schema
+    assert app.openapi() is schema
+    # a schema assigned by the app itself is returned as is
+    custom_schema = {"openapi": "3.1.0", "info": {"title": "custom"}}
+    app.openapi_schema = custom_schema
+    assert app.openapi() is custom_schema
+    token = context.extendable_registry.set(other_registry)
+    try:
+        assert app.openapi() is custom_schema
+    finally:
+        context.extendable_registry.reset(token)
+    app.openapi_schema = None
+    assert app.openapi() is schema
+
+    @app.get("/other")
+    def other() -> int:
+        return 1
+
+    new_schema = app.openapi()
+    assert new_schema is not schema
+    assert "/other" in new_schema["paths"]
+
+
+def test_param_annotations_cached(test_fastapi, test_registry):
+    app = test_fastapi.app
+
+    @app.get("/int")
+    def get_int(value: int) -> int:
+        return value
+
+    response = test_fastapi.get("/extended", params={"name": "echo", "id": 3})
+    assert response.json() == {"name": "echo", "id": 3}
+    cache = get_registry_cache(test_registry, "param_annotations")
+    assert int not in cache
+    # depending on the fastapi version, the model is given as is or annotated
+    # with its dependency
+    models = {
+        get_args(new_type)[0] if get_origin(new_type) is Annotated else new_type
+        for new_type in cache.values()
+    }
+    assert len(models) == 1
+    assert "id" in models.pop().model_fields
+    response = test_fastapi.get("/int", params={"value": 3})
+    assert response.json() == 3
+
+
+@skip_not_supported_version_for_generics
+def test_generic_route_declared_after_init(test_registry):
+    T = TypeVar("T")
+
+    class SearchResult(ExtendableBaseModel, Generic[T]):
+        total: int
+        results: List[T]
+
+    class Location(ExtendableBaseModel):
+        name: str
+
+    class LocationExtended(Location, extends=True):
+        lat: float = 0.1
+
+    test_registry.init_registry()
+    location_result = SearchResult[Location]
+    assembled = resolve_annotation(location_result)
+    # an assembled class is resolved as itself
+    assert resolve_annotation(assembled) is assembled
+    assert (
+        assembled.model_fields["results"].annotation
+        == List[test_registry[Location.__xreg_name__]]
+    )
+
+    app = FastAPI()
+
+    @app.get("/search")
+    def search() -> location_result:
+        return location_result(total=1, results=[{"name": "a"}])
+
+    with TestClient(app) as client:
+        schema = client.get("/openapi.json").json()
+        response = client.get("/search")
+    assert response.json() == {
+        "total": 1,
+        "results": [{"name": "a", "lat": 0.1}],
+    }
+    (name,) = [name for name in schema["components"]["schemas"] if "Search" in name]
+    items = schema["components"]["schemas"][name]["properties"]["results"]["items"]
+    assert items == {"$ref": "#/components/schemas/Location"}
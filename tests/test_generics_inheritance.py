@@ -1,5 +1,7 @@
 """Test generics model inheritance."""
 
+import gc
+import weakref
 from typing import Generic, List, TypeVar, Optional
 
 try:
@@ -7,10 +9,13 @@ try:
 except ImportError:
     from typing_extensions import Literal
 
+from extendable import main as extendable_main
 from pydantic.main import BaseModel
+from typing_extensions import get_args
 
-from extendable_pydantic import ExtendableModelMeta
+from extendable_pydantic import ExtendableModelMeta, main
 from extendable_pydantic.models import ExtendableBaseModel
+from extendable_pydantic.utils import resolve_annotation
 
 from .conftest import skip_not_supported_version_for_generics
 
@@ -222,3 +227,132 @@ def test_extended_generics_of_extended_model(test_registry):
         "total": 0,
         "results": [{"kind": "view", "my_list": ["a", "b"], "name": "name"}],
     }
+
+
+@skip_not_supported_version_for_generics
+def test_parametrized_generics_cache(test_registry, monkeypatch):
+    monkeypatch.setattr(main, "parametrized_generics_cache_size", 1)
+    T = TypeVar("T")
+
+    class SearchResult(ExtendableBaseModel, Generic[T]):
+        total: int
+        results: List[T]
+
+    class Location(ExtendableBaseModel):
+        name: str
+
+    class SearchLocationResult(SearchResult[Location]):
+        pass
+
+    class SearchIntResult(SearchResult[int]):
+        pass
+
+    test_registry.init_registry()
+    location_result = SearchResult[Location]
+    first = location_result(total=0, results=[])
+    second = location_result(total=1, results=[{"name": "a"}])
+    assert type(first) is type(second)
+    assert second.results[0].name == "a"
+    info = main.get_parametrized_generics_cache_info(test_registry)
+    assert (info.hits, info.misses, info.evictions) == (1, 1, 0)
+    SearchResult[int](total=0, results=[1])
+    location_result(total=0, results=[])
+    info = main.get_parametrized_generics_cache_info(test_registry)
+    assert (info.hits, info.misses, info.evictions) == (1, 3, 2)
+    assert info.currsize == 1
+
+
+@skip_not_supported_version_for_generics
+def test_parametrize_after_init(test_registry, monkeypatch):
+    monkeypatch.setattr(main, "parametrized_generics_cache_size", 1)
+    T = TypeVar("T")
+
+    class SearchResult(ExtendableBaseModel, Generic[T]):
+        total: int
+        results: List[T]
+
+    class Location(ExtendableBaseModel):
+        name: str
+
+    class SearchResultExtended(SearchResult[T], Generic[T], extends=True):
+        page: int = 0
+
+    class LocationExtended(Location, extends=True):
+        lat: float = 0.1
+
+    test_registry.init_registry()
+    # parametrized once the registry is initialized
+    location_result = SearchResult[Location]
+    int_result = SearchResult[int]
+    result = location_result(total=1, results=[{"name": "a"}])
+    assert result.page == 0
+    assert result.results[0].lat == 0.1
+    assert location_result.model_validate({"total": 0, "results": []}).page == 0
+    assembled_ref = weakref.ref(type(result))
+    del result
+    assert type(int_result(total=0, results=["1"])).__name__ == "SearchResult[int]"
+    gc.collect()
+    # evicted from the cache of the registry, the assembled class is released
+    assert assembled_ref() is None
+    assert main.get_parametrized_generics_cache_info(test_registry).evictions == 1
+
+
+@skip_not_supported_version_for_generics
+def test_parametrize_after_init_build_mode(test_registry, monkeypatch):
+    T = TypeVar("T")
+
+    class SearchResult(ExtendableBaseModel, Generic[T]):
+        total: int
+        results: List[T]
+
+    test_registry.init_registry()
+    int_result = SearchResult[int]
+    class_defs = sum(
+        map(len, extendable_main._extendable_class_defs_by_module.values())
+    )
+    build_modes = []
+    build_original_class = ExtendableModelMeta._build_original_class.__func__
+
+    def _build_original_class(metacls, name, *args, **kwargs):
+        build_modes.append(extendable_main._registry_build_mode)
+        return build_original_class(metacls, name, *args, **kwargs)
+
+    monkeypatch.setattr(
+        ExtendableModelMeta, "_build_original_class", classmethod(_build_original_class)
+    )
+    assert int_result(total=1, results=["1"]).results == [1]
+    # the assembled class is created without switching the registries of the
+    # process into build mode and is not collected as a class definition
+    assert build_modes == [False]
+    assert (
+        sum(map(len, extendable_main._extendable_class_defs_by_module.values()))
+        == class_defs
+    )
+
+
+@skip_not_supported_version_for_generics
+def test_resolve_annotation_parametrized_after_init(test_registry):
+    T = TypeVar("T")
+
+    class SearchResult(ExtendableBaseModel, Generic[T]):
+        total: int
+        results: List[T]
+
+    class Location(ExtendableBaseModel):
+        name: str
+
+    class SearchResultExtended(SearchResult[T], Generic[T], extends=True):
+        page: int = 0
+
+    class LocationExtended(Location, extends=True):
+        lat: float = 0.1
+
+    test_registry.init_registry()
+    # parametrized once the registry is initialized
+    location_result = SearchResult[Location]
+    resolved = resolve_annotation(List[location_result])
+    assembled = get_args(resolved)[0]
+    assert assembled is main._get_cached_assembled_cls(location_result, test_registry)
+    assert set(assembled.model_fields) == {"total", "results", "page"}
+    result = assembled(total=1, results=[{"name": "a"}])
+    assert result.results[0].lat == 0.1
@@ -0,0 +1,43 @@
+"""Test the patcher imported at the interpreter startup."""
+
+import os
+import subprocess
+import sys
+
+import extendable_pydantic_patcher
+
+# maximum time spent to import the patcher (in microseconds)
+IMPORT_TIME_BUDGET = 20000
+
+
+def _run(*args: str) -> subprocess.CompletedProcess:
+    path = os.path.dirname(extendable_pydantic_patcher.__file__)
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [path, env.get("PYTHONPATH")]))
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, env=env, check=True
+    )
+
+
+def test_patcher_import_time():
+    # -S to not import the patcher through the .pth file
+    result = _run("-S", "-X", "importtime", "-c", "import extendable_pydantic_patcher")
+    import_times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _self, cumulative, name = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit():
+            import_times[name.strip()] = int(cumulative)
+    assert "extendable_pydantic_patcher" in import_times
+    assert not {"extendable_pydantic", "pydantic", "wrapt"} & set(import_times)
+    assert import_times["extendable_pydantic_patcher"] < IMPORT_TIME_BUDGET
+
+
+def test_patches_loaded_with_fastapi():
+    code = (
+        "import sys, extendable_pydantic_patcher, fastapi;"
+        "print('extendable_pydantic._patch' in sys.modules)"
+    )
+    result = _run("-c", code)
+    assert result.stdout.strip() == "True"
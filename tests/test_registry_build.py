@@ -0,0 +1,460 @@
+"""Test the build of the assembled classes."""
+
+import importlib
+import sys
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Generic, List, Optional, TypeVar
+
+import pytest
+from extendable import registry
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from pydantic._internal import _model_construction
+
+from extendable_pydantic import (
+    ExtendableBaseModel,
+    ExtendableModelMeta,
+    main,
+    update_registry,
+    warm_registry,
+)
+
+
+@pytest.fixture
+def schema_builds(monkeypatch) -> Counter:
+    """Count the schema builds per class.
+
+    Only the completed builds are counted, the builds deferred by pydantic
+    (e.g. on an undefined forward reference) are not.
+    """
+    builds: Counter = Counter()
+    complete_model_class = _model_construction.complete_model_class
+
+    def _complete_model_class(cls, *args, **kwargs):
+        result = complete_model_class(cls, *args, **kwargs)
+        if cls.__pydantic_complete__:
+            builds[cls] += 1
+        return result
+
+    monkeypatch.setattr(
+        _model_construction, "complete_model_class", _complete_model_class
+    )
+    return builds
+
+
+@pytest.fixture
+def type_adapter_builds(monkeypatch) -> List[TypeAdapter]:
+    """Collect the type adapters built (e.g. for the fields of the routes)."""
+    builds: List[TypeAdapter] = []
+    init = TypeAdapter.__init__
+
+    def _init(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        builds.append(self)
+
+    monkeypatch.setattr(TypeAdapter, "__init__", _init)
+    return builds
+
+
+def test_one_build_per_assembled_class(test_registry, schema_builds):
+    class Coordinate(ExtendableBaseModel):
+        lat: float = 0.1
+        lng: float = 10.1
+
+    class Person(ExtendableBaseModel):
+        name: str
+        coordinate: Optional[Coordinate] = None
+        friends: List["Person"] = []
+
+    class Company(ExtendableBaseModel):
+        name: str
+        employees: List[Person] = []
+
+    class ExtendedCoordinate(Coordinate, extends=True):
+        country: str = "belgium"
+
+    class ExtendedPerson(Person, extends=True):
+        company: Optional[Company] = None
+
+    test_registry.init_registry()
+    originals = (Coordinate, Person, Company, ExtendedCoordinate, ExtendedPerson)
+    assert not any(schema_builds[cls] for cls in originals)
+    assembled = [test_registry[cls.__xreg_name__] for cls in originals[:3]]
+    assert [schema_builds[cls] for cls in assembled] == [1, 1, 1]
+
+    person = Person(
+        name="p",
+        coordinate={},
+        friends=[{"name": "f", "company": {"name": "c"}}],
+    )
+    assert person.model_dump() == {
+        "name": "p",
+        "coordinate": {"lat": 0.1, "lng": 10.1, "country": "belgium"},
+        "friends": [
+            {
+                "name": "f",
+                "coordinate": None,
+                "friends": [],
+                "company": {"name": "c", "employees": []},
+            }
+        ],
+        "company": None,
+    }
+    assert [schema_builds[cls] for cls in assembled] == [1, 1, 1]
+
+
+def test_parallel_build(test_registry, schema_builds, monkeypatch):
+    monkeypatch.setattr(main, "schema_build_workers", 4)
+
+    class Coordinate(ExtendableBaseModel):
+        lat: float = 0.1
+
+    class Person(ExtendableBaseModel):
+        name: str
+        coordinate: Optional[Coordinate] = None
+        friends: List["Person"] = []
+
+    class Tag(ExtendableBaseModel):
+        name: str
+
+    class ExtendedCoordinate(Coordinate, extends=True):
+        country: str = "belgium"
+
+    class ExtendedTag(Tag, extends=True):
+        color: str = "red"
+
+    test_registry.init_registry()
+    assembled = [test_registry[cls.__xreg_name__] for cls in (Coordinate, Person, Tag)]
+    assert [schema_builds[cls] for cls in assembled] == [1, 1, 1]
+    assert Person(name="p", coordinate={}, friends=[{"name": "f"}]).model_dump() == {
+        "name": "p",
+        "coordinate": {"lat": 0.1, "country": "belgium"},
+        "friends": [{"name": "f", "coordinate": None, "friends": []}],
+    }
+    assert Tag(name="t").model_dump() == {"name": "t", "color": "red"}
+
+
+def test_dependency_levels(test_registry):
+    class Coordinate(ExtendableBaseModel):
+        lat: float = 0.1
+
+    class Person(ExtendableBaseModel):
+        coordinate: Optional[Coordinate] = None
+        company: Optional["Company"] = None
+
+    class Company(ExtendableBaseModel):
+        employees: List[Person] = []
+
+    class Tag(ExtendableBaseModel):
+        name: str
+
+    Person.model_rebuild()
+    levels = main._dependency_levels([Coordinate, Tag, Company, Person])
+    assert levels == [[Coordinate, Tag, Company], [Person]]
+
+
+def test_warm_registry(test_registry, schema_builds, type_adapter_builds):
+    T = TypeVar("T")
+
+    class Coordinate(ExtendableBaseModel, defer_build=True):
+        lat: float = 0.1
+
+    class Person(ExtendableBaseModel):
+        name: str
+        coordinate: Optional[Coordinate] = None
+
+    class SearchResult(ExtendableBaseModel, Generic[T]):
+        total: int
+        results: List[T]
+
+    class ExtendedCoordinate(Coordinate, extends=True):
+        country: str = "belgium"
+
+    test_registry.init_registry()
+    coordinate_cls = test_registry[Coordinate.__xreg_name__]
+    assert not coordinate_cls.__pydantic_complete__
+
+    # the routes of the included routers are built on their first use
+    app = FastAPI()
+    router = APIRouter()
+
+    @router.post("/search")
+    def search(person: Person) -> SearchResult[Person]:
+        return SearchResult[Person](total=1, results=[person])
+
+    app.include_router(router)
+    # a schema assigned by the app is not generated again
+    app.openapi_schema = {"openapi": "3.1.0", "info": {"title": "custom"}}
+
+    warm_registry(test_registry, apps=[app])
+    assert coordinate_cls.__pydantic_complete__
+    schema_builds.clear()
+    person = Person.model_validate({"name": "p", "coordinate": {}})
+    assert Coordinate.model_validate_json('{"lat": 1}').country == "belgium"
+    assert Person.model_json_schema()
+    assert person.model_dump_json()
+    type_adapter_builds.clear()
+    with TestClient(app) as client:
+        response = client.post("/search", json={"name": "p", "coordinate": {}})
+    assert response.json()["results"][0]["coordinate"]["country"] == "belgium"
+    # pydantic may define its own models on first use (e.g. RootModel)
+    assert not [cls for cls in schema_builds if isinstance(cls, ExtendableModelMeta)]
+    assert not type_adapter_builds
+
+
+_BASE_MODULE = """
+from typing import Optional
+
+from extendable_pydantic import ExtendableBaseModel
+
+
+class Coordinate(ExtendableBaseModel):
+    lat: float = 0.1
+    lng: float = 10.1
+
+
+class Address(Coordinate):
+    street: str = ""
+
+
+class Person(ExtendableBaseModel):
+    name: str
+    coordinate: Optional[Coordinate] = None
+
+
+class Company(ExtendableBaseModel):
+    name: str
+"""
+
+_EXTENSION_MODULE = """
+from xreg_update_base import Coordinate
+
+
+class ExtendedCoordinate(Coordinate, extends=True):
+    country: str = "belgium"
+"""
+
+
+@pytest.fixture
+def update_modules(tmp_path, monkeypatch):
+    """Write a module of models and a module extending them."""
+    (tmp_path / "xreg_update_base.py").write_text(_BASE_MODULE)
+    (tmp_path / "xreg_update_extension.py").write_text(_EXTENSION_MODULE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    try:
+        yield "xreg_update_base", "xreg_update_extension"
+    finally:
+        sys.modules.pop("xreg_update_base", None)
+        sys.modules.pop("xreg_update_extension", None)
+
+
+def test_update_registry(test_registry, schema_builds, update_modules, monkeypatch):
+    base_module, extension_module = update_modules
+    models = importlib.import_module(base_module)
+    Coordinate, Address, Person, Company = (
+        models.Coordinate,
+        models.Address,
+        models.Person,
+        models.Company,
+    )
+    test_registry.init_registry()
+    previous = {
+        cls: test_registry[cls.__xreg_name__]
+        for cls in (Coordinate, Address, Person, Company)
+    }
+
+    # the extension is defined into a module loaded once the registry is
+    # initialized
+    importlib.import_module(extension_module)
+    schema_builds.clear()
+    assembled = []
+    build_extendable_class = test_registry.build_extendable_class
+
+    def _build_extendable_class(class_def):
+        assembled.append(class_def.name)
+        return build_extendable_class(class_def)
+
+    monkeypatch.setattr(
+        test_registry, "build_extendable_class", _build_extendable_class
+    )
+    update_registry(test_registry)
+    # only the classes impacted by the extension are assembled and built again:
+    # the extended class, the class inheriting from it and the class
+    # referencing it
+    assert sorted(assembled) == sorted(
+        cls.__xreg_name__ for cls in (Coordinate, Address, Person)
+    )
+    assert test_registry[Company.__xreg_name__] is previous[Company]
+    assert test_registry[Coordinate.__xreg_name__] is not previous[Coordinate]
+    assert test_registry[Address.__xreg_name__] is not previous[Address]
+    assert test_registry[Person.__xreg_name__] is not previous[Person]
+    assert schema_builds[previous[Company]] == 0
+    assert Address().model_dump() == {
+        "lat": 0.1,
+        "lng": 10.1,
+        "street": "",
+        "country": "belgium",
+    }
+
+    full_registry = registry.ExtendableClassesRegistry()
+    full_registry.init_registry()
+    for cls in (Coordinate, Address, Person, Company):
+        assert (
+            test_registry[cls.__xreg_name__].model_json_schema()
+            == full_registry[cls.__xreg_name__].model_json_schema()
+        )
+    person = Person(name="p", coordinate={})
+    assert person.model_dump() == {
+        "name": "p",
+        "coordinate": {"lat": 0.1, "lng": 10.1, "country": "belgium"},
+    }
+
+
+def test_lazy_build(test_registry, schema_builds, monkeypatch):
+    monkeypatch.setattr(main, "lazy_build", True)
+
+    class Coordinate(ExtendableBaseModel):
+        lat: float = 0.1
+        lng: float = 10.1
+
+    class Person(ExtendableBaseModel):
+        name: str
+        coordinate: Optional[Coordinate] = None
+
+    class Company(ExtendableBaseModel):
+        name: str
+
+    class ExtendedCoordinate(Coordinate, extends=True):
+        country: str = "belgium"
+
+    test_registry.init_registry()
+    assert not any(schema_builds.values())
+    person = Person(name="p", coordinate={})
+    assert person.model_dump() == {
+        "name": "p",
+        "coordinate": {"lat": 0.1, "lng": 10.1, "country": "belgium"},
+    }
+    assert schema_builds[test_registry[Person.__xreg_name__]] == 1
+    assert schema_builds[test_registry[Company.__xreg_name__]] == 0
+    assert Company.model_validate({"name": "c"}).name == "c"
+    assert schema_builds[test_registry[Company.__xreg_name__]] == 1
+
+    monkeypatch.setattr(main, "lazy_build", False)
+    eager_registry = registry.ExtendableClassesRegistry()
+    eager_registry.init_registry()
+    for cls in (Coordinate, Person, Company):
+        assert (
+            test_registry[cls.__xreg_name__].model_json_schema()
+            == eager_registry[cls.__xreg_name__].model_json_schema()
+        )
+
+
+def test_lazy_build_threads(test_registry, schema_builds, monkeypatch):
+    monkeypatch.setattr(main, "lazy_build", True)
+
+    class Coordinate(ExtendableBaseModel):
+        lat: float = 0.1
+
+    class Person(ExtendableBaseModel):
+        name: str
+        coordinate: Optional[Coordinate] = None
+
+    test_registry.init_registry()
+    barrier = threading.Barrier(8)
+
+    def create_person():
+        barrier.wait()
+        return Person(name="p", coordinate={})
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [
+            executor.submit(copy_context().run, create_person) for _i in range(8)
+        ]
+        persons = [future.result() for future in futures]
+    assembled = test_registry[Person.__xreg_name__]
+    assert all(type(person) is assembled for person in persons)
+    assert schema_builds[assembled] == 1
+
+
+class _ContentionLock:
+    """Re-entrant lock counting the acquisitions and those that had to wait."""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.acquisitions = 0
+        self.contentions = 0
+
+    def __enter__(self):
+        self.acquisitions += 1
+        if not self.lock.acquire(blocking=False):
+            self.contentions += 1
+            self.lock.acquire()
+        return self
+
+    def __exit__(self, *args):
+        self.lock.release()
+
+
+def test_first_use_stress(test_registry, schema_builds, monkeypatch):
+    monkeypatch.setattr(main, "lazy_build", True)
+    lock = _ContentionLock()
+    monkeypatch.setattr(main, "_resolve_lock", lock)
+
+    class Coordinate(ExtendableBaseModel):
+        lat: float = 0.1
+
+    class Person(ExtendableBaseModel):
+        name: str
+        coordinate: Optional[Coordinate] = None
+        friends: List["Person"] = []
+
+    class Company(ExtendableBaseModel):
+        name: str
+        employees: List[Person] = []
+
+    class ExtendedCoordinate(Coordinate, extends=True):
+        country: str = "belgium"
+
+    test_registry.init_registry()
+    nb_threads = 16
+    barrier = threading.Barrier(nb_threads)
+
+    def use_models(i):
+        barrier.wait()
+        models = [
+            ("company", lambda: Company(name="c", employees=[{"name": "p"}])),
+            (
+                "person",
+                lambda: Person(name="p", coordinate={}, friends=[{"name": "f"}]),
+            ),
+            ("coordinate", lambda: Coordinate()),
+        ]
+        # each thread starts with a different model
+        models = models[i % 3 :] + models[: i % 3]
+        return {name: model() for name, model in models}
+
+    def run_round():
+        with ThreadPoolExecutor(max_workers=nb_threads) as executor:
+            futures = [
+                executor.submit(copy_context().run, use_models, i)
+                for i in range(nb_threads)
+            ]
+            return [future.result() for future in futures]
+
+    results = run_round()
+    for result in results:
+        assert result["company"].employees[0].name == "p"
+        assert result["person"].coordinate.country == "belgium"
+        assert result["coordinate"].country == "belgium"
+    for cls in (Coordinate, Person, Company):
+        assert schema_builds[test_registry[cls.__xreg_name__]] == 1
+    # once the classes are resolved, their uses no longer take the lock
+    acquisitions, contentions = lock.acquisitions, lock.contentions
+    results = run_round()
+    assert all(result["coordinate"].country == "belgium" for result in results)
+    assert lock.acquisitions == acquisitions
+    assert lock.contentions == contentions
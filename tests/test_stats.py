@@ -0,0 +1,75 @@
+"""Test the statistics about the build of the registries."""
+
+import sys
+from typing import List, Optional
+
+import pytest
+
+from extendable_pydantic import ExtendableBaseModel, stats
+from extendable_pydantic.__main__ import main
+
+
+@pytest.fixture
+def enable_stats():
+    stats.enable()
+    try:
+        yield
+    finally:
+        stats.disable()
+
+
+def test_disabled_by_default(test_registry):
+    class Coordinate(ExtendableBaseModel):
+        lat: float = 0.1
+
+    test_registry.init_registry()
+    assert stats.collector is None
+    assert stats.get_registry_stats(test_registry) == {}
+
+
+def test_registry_stats(test_registry, enable_stats):
+    class Coordinate(ExtendableBaseModel):
+        lat: float = 0.1
+
+    class Person(ExtendableBaseModel):
+        name: str
+        coordinate: Optional[Coordinate] = None
+        friends: List["Person"] = []
+
+    class ExtendedCoordinate(Coordinate, extends=True):
+        country: str = "belgium"
+
+    test_registry.init_registry()
+    registry_stats = stats.get_registry_stats(test_registry)
+    person_stats = registry_stats[Person.__xreg_name__]
+    coordinate_stats = registry_stats[Coordinate.__xreg_name__]
+    for class_stats in (person_stats, coordinate_stats):
+        assert class_stats.assembly_time > 0
+        assert class_stats.resolve_time > 0
+        assert class_stats.build_time > 0
+        assert class_stats.rebuild_count == 1
+        assert class_stats.core_schema_size > 0
+    assert person_stats.core_schema_size > coordinate_stats.core_schema_size
+    assert len(registry_stats.slowest(1)) == 1
+    assert registry_stats.total.rebuild_count == len(registry_stats)
+
+
+def test_command_line(test_registry, tmp_path, monkeypatch, capsys):
+    (tmp_path / "stats_models.py").write_text(
+        "from extendable_pydantic import ExtendableBaseModel\n"
+        "\n"
+        "class Coordinate(ExtendableBaseModel):\n"
+        "    lat: float = 0.1\n"
+        "\n"
+        "class ExtendedCoordinate(Coordinate, extends=True):\n"
+        "    country: str = 'belgium'\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    try:
+        assert main(["stats_models"]) == 0
+    finally:
+        stats.disable()
+        sys.modules.pop("stats_models", None)
+    output = capsys.readouterr().out
+    assert "Coordinate" in output
+    assert "total" in output
@@ -1,17 +1,23 @@
 """Test Union."""
 
 import sys
-from typing import Union, Any, Optional
+from typing import Union, Any, List, Optional
 
 if sys.version_info >= (3, 9):
     from typing import Annotated
 else:
     from typing_extensions import Annotated
 
-from pydantic import Tag, Discriminator
+try:
+    from typing import Literal
+except ImportError:
+    from typing_extensions import Literal
+
+import pytest
+from pydantic import Tag, Discriminator, ValidationError
 from pydantic.main import BaseModel
 
-from extendable_pydantic import ExtendableModelMeta
+from extendable_pydantic import ExtendableBaseModel, ExtendableModelMeta
 
 from pytest import fixture
 
@@ -180,3 +186,68 @@ def test_union_validate_on_assign(model_union_base_models, test_registry):
         )
         coordinate = person.coordinate
         assert isinstance(coordinate, Coordinate)
+
+
+def test_auto_discriminator(test_registry):
+    class Cat(ExtendableBaseModel):
+        name: str
+
+    class Dog(ExtendableBaseModel):
+        name: str
+
+    class Owner(ExtendableBaseModel):
+        model_config = {"xreg_auto_discriminator": True}
+        pets: List[Union[Cat, Dog]] = []
+        pet: Optional[Union[Cat, Dog]] = None
+
+    class Person(ExtendableBaseModel):
+        pet: Optional[Union[Cat, Dog]] = None
+
+    class CatExtended(Cat, extends=True):
+        kind: Literal["cat"]
+
+    class DogExtended(Dog, extends=True):
+        kind: Literal["dog", "wolf"]
+
+    test_registry.init_registry()
+    schema = test_registry[Owner.__xreg_name__].model_json_schema()
+    assert schema["properties"]["pets"]["items"]["discriminator"]["propertyName"] == (
+        "kind"
+    )
+    person_schema = test_registry[Person.__xreg_name__].model_json_schema()
+    assert "discriminator" not in str(person_schema)
+
+    owner = Owner(
+        pets=[{"kind": "wolf", "name": "rex"}], pet={"kind": "cat", "name": "tom"}
+    )
+    assert isinstance(owner.pets[0], Dog)
+    assert isinstance(owner.pet, Cat)
+    with pytest.raises(ValidationError) as error:
+        Owner(pets=[{"kind": "bird", "name": "tweety"}])
+    assert error.value.errors()[0]["type"] == "union_tag_invalid"
+
+
+def test_auto_discriminator_not_required(test_registry):
+    class Cat(ExtendableBaseModel):
+        name: str
+
+    class Dog(ExtendableBaseModel):
+        name: str
+
+    class Owner(ExtendableBaseModel):
+        model_config = {"xreg_auto_discriminator": True}
+        pets: List[Union[Cat, Dog]] = []
+
+    class CatExtended(Cat, extends=True):
+        kind: Literal["cat"] = "cat"
+
+    class DogExtended(Dog, extends=True):
+        kind: Literal["dog"] = "dog"
+
+    test_registry.init_registry()
+    schema = test_registry[Owner.__xreg_name__].model_json_schema()
+    assert "discriminator" not in str(schema)
+    # the tag has a default value, the payloads without it are still valid
+    owner = Owner(pets=[{"name": "tom"}, {"kind": "dog", "name": "rex"}])
+    assert isinstance(owner.pets[0], Cat)
+    assert isinstance(owner.pets[1], Dog)
@@ -0,0 +1,35 @@
+"""Test utils."""
+
+from typing import List, Optional
+
+from extendable_pydantic import ExtendableBaseModel
+from extendable_pydantic.main import RegistryListener
+from extendable_pydantic.utils import get_registry_cache, resolve_annotation
+
+
+def test_resolve_annotation_cached(test_registry):
+    class MyModel(ExtendableBaseModel):
+        x: str
+
+    class MyModelExtended(MyModel, extends=True):
+        y: str = "y"
+
+    test_registry.init_registry()
+    assembled = test_registry[MyModel.__xreg_name__]
+    annotation = List[Optional[MyModel]]
+    resolved = resolve_annotation(annotation)
+    assert resolved == List[Optional[assembled]]
+    assert resolve_annotation(annotation) is resolved
+    cache = get_registry_cache(test_registry, "resolve_annotation")
+    assert cache[id(annotation)] == (annotation, resolved)
+
+
+def test_resolve_annotation_cache_dropped_on_init(test_registry):
+    class MyModel(ExtendableBaseModel):
+        x: str
+
+    test_registry.init_registry()
+    resolve_annotation(List[MyModel])
+    assert get_registry_cache(test_registry, "resolve_annotation")
+    RegistryListener().before_init_registry(test_registry)
+    assert not get_registry_cache(test_registry, "resolve_annotation")